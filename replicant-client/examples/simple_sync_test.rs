@@ -1,4 +1,4 @@
-use replicant_client::Client;
+use replicant_client::{Client, ClientDatabaseOptions};
 use serde_json::json;
 use std::env;
 use std::sync::Arc;
@@ -27,15 +27,22 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
         eprintln!("  sync --database <path> --user <email>");
         eprintln!("  status --database <path> --user <email>");
         eprintln!("  daemon --database <path> --user <email>");
+        eprintln!("  batch --database <path> --user <email> [--script <op[:k=v,...]|op...>]");
+        eprintln!("        (without --script, steps are read from stdin, one per line;");
+        eprintln!("        values cannot contain '|', ':', ',' or newlines)");
+        eprintln!("Options:");
+        eprintln!("  --db-dir <dir>  directory for <path>.sqlite3 (default: databases)");
         std::process::exit(1);
     }
 
     let action = &args[1];
-    let mut database_path = String::new();
+    let mut database_name = String::new();
+    let mut db_dir = "databases".to_string();
     let mut user_email = String::new();
     let mut doc_id = None;
     let mut title = String::new();
     let mut description = String::new();
+    let mut script = None;
 
     // Parse arguments
     let mut i = 2;
@@ -43,13 +50,22 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
         match args[i].as_str() {
             "--database" => {
                 if i + 1 < args.len() {
-                    database_path = format!("sqlite:databases/{}.sqlite3?mode=rwc", args[i + 1]);
+                    database_name = args[i + 1].clone();
                     i += 2;
                 } else {
                     eprintln!("--database requires a value");
                     std::process::exit(1);
                 }
             }
+            "--db-dir" => {
+                if i + 1 < args.len() {
+                    db_dir = args[i + 1].clone();
+                    i += 2;
+                } else {
+                    eprintln!("--db-dir requires a value");
+                    std::process::exit(1);
+                }
+            }
             "--user" => {
                 if i + 1 < args.len() {
                     user_email = args[i + 1].clone();
@@ -86,6 +102,15 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
                     std::process::exit(1);
                 }
             }
+            "--script" => {
+                if i + 1 < args.len() {
+                    script = Some(args[i + 1].clone());
+                    i += 2;
+                } else {
+                    eprintln!("--script requires a value");
+                    std::process::exit(1);
+                }
+            }
             _ => {
                 eprintln!("Unknown argument: {}", args[i]);
                 std::process::exit(1);
@@ -93,11 +118,16 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
         }
     }
 
-    if database_path.is_empty() || user_email.is_empty() {
+    if database_name.is_empty() || user_email.is_empty() {
         eprintln!("--database and --user are required");
         std::process::exit(1);
     }
 
+    // Point --db-dir at a tmpfs such as /dev/shm to take commit fsyncs off
+    // the disk for throwaway test databases
+    std::fs::create_dir_all(&db_dir)?;
+    let database_path = format!("sqlite:{}/{}.sqlite3?mode=rwc", db_dir, database_name);
+
     info!(
         "Starting simple_sync_test: action={}, database={}, user={}",
         action, database_path, user_email
@@ -105,124 +135,17 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
 
     // Create sync engine (auto-starts with built-in reconnection)
     debug!("Creating sync engine for database: {}", database_path);
-    let engine = Client::new(
+    let engine = Client::new_with_db_options(
         &database_path,
         "ws://localhost:8080/ws",
         &user_email,
         "test-key",
         "test-secret",
+        ClientDatabaseOptions::tuned(),
     )
     .await?;
 
     match action.as_str() {
-        "create" => {
-            if title.is_empty() {
-                eprintln!("--title is required for create");
-                std::process::exit(1);
-            }
-
-            let content = json!({
-                "title": title,
-                "description": description
-            });
-
-            debug!("Creating document with content: {:?}", content);
-            let document = engine.create_document(content).await?;
-            info!("Successfully created document: {}", document.id);
-            println!("Created document: {}", document.id);
-
-            // Allow time for immediate sync to complete before disconnecting
-            tokio::time::sleep(std::time::Duration::from_millis(500)).await;
-        }
-
-        "update" => {
-            let id = doc_id.ok_or("--id is required for update")?;
-            if title.is_empty() {
-                eprintln!("--title is required for update");
-                std::process::exit(1);
-            }
-
-            let content = json!({
-                "title": title,
-                "description": description
-            });
-
-            debug!("Updating document {} with content: {:?}", id, content);
-            engine.update_document(id, content).await?;
-
-            // Allow time for immediate sync to complete before disconnecting
-            tokio::time::sleep(std::time::Duration::from_millis(500)).await;
-            info!("Successfully updated document: {}", id);
-            println!("Updated document: {}", id);
-        }
-
-        "delete" => {
-            let id = doc_id.ok_or("--id is required for delete")?;
-            engine.delete_document(id).await?;
-
-            // Allow time for immediate sync to complete before disconnecting
-            tokio::time::sleep(std::time::Duration::from_millis(500)).await;
-            println!("Deleted document: {}", id);
-        }
-
-        "list" => {
-            let documents = engine.get_all_documents().await?;
-            if documents.is_empty() {
-                println!("No documents found");
-            } else {
-                for doc in documents {
-                    let title = doc
-                        .content
-                        .get("title")
-                        .and_then(|v| v.as_str())
-                        .unwrap_or("No title");
-                    let desc = doc
-                        .content
-                        .get("description")
-                        .and_then(|v| v.as_str())
-                        .unwrap_or("");
-
-                    println!(
-                        "Document: {} | Title: {} | Description: {}",
-                        doc.id, title, desc
-                    );
-                }
-            }
-        }
-
-        "sync" => {
-            info!("Starting sync_all operation");
-            let start = std::time::Instant::now();
-            engine.sync_all().await?;
-            let elapsed = start.elapsed();
-            info!("Sync completed in {:?}", elapsed);
-
-            // Allow time for sync messages to complete before disconnecting
-            tokio::time::sleep(std::time::Duration::from_millis(500)).await;
-            println!("Sync completed");
-        }
-
-        "status" => {
-            let documents = engine.get_all_documents().await?;
-            println!("Database: {}", database_path);
-            println!("User: {}", user_email);
-            println!("Documents: {}", documents.len());
-
-            for doc in documents {
-                let title = doc
-                    .content
-                    .get("title")
-                    .and_then(|v| v.as_str())
-                    .unwrap_or("No title");
-
-                println!("  {} | {}", doc.id, title);
-            }
-
-            // Allow extra time for potential incoming sync messages (like auto-sync after reconnection)
-            info!("Waiting for potential incoming sync updates...");
-            tokio::time::sleep(std::time::Duration::from_millis(1000)).await;
-        }
-
         "daemon" => {
             // Daemon mode - keep sync engine alive and process commands from stdin
             info!("Starting daemon mode - sync engine will stay alive");
@@ -233,6 +156,29 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
 
             println!("DAEMON_READY");
 
+            // Push a status line whenever the document count, pending count or
+            // connection state changes, so drivers can watch for a state instead
+            // of polling with STATUS. Connection changes and the pending queue
+            // draining while online also get their own EVENT line, so a
+            // driver can wait on a single token
+            let engine_for_status = engine.clone();
+            let status_task = tokio::spawn(async move {
+                let mut last_status: Option<DaemonStatus> = None;
+                loop {
+                    // A count that could not be read is not a state change, so
+                    // skip the poll rather than report zeros
+                    if let Some(status) = daemon_status(&engine_for_status).await {
+                        let events = status_events(last_status, status);
+                        if !events.is_empty() {
+                            // One write, so command responses can't interleave
+                            print!("{}", events);
+                            last_status = Some(status);
+                        }
+                    }
+                    tokio::time::sleep(std::time::Duration::from_millis(200)).await;
+                }
+            });
+
             // Process stdin commands in a separate async task
             let stdin_task = tokio::spawn(async move {
                 use tokio::io::{AsyncBufReadExt, BufReader};
@@ -316,51 +262,62 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
                                 println!("RESPONSE:ERROR:UPDATE requires doc_id:title:description");
                             }
                         }
-                        Some(&"STATUS") => {
-                            // Use timeouts to prevent blocking during reconnection
-                            let doc_count_future = engine_for_stdin.count_documents();
-                            let pending_count_future = engine_for_stdin.count_pending_sync();
-
-                            let doc_count = match tokio::time::timeout(
-                                std::time::Duration::from_millis(500),
-                                doc_count_future,
-                            )
-                            .await
-                            {
-                                Ok(Ok(count)) => count,
-                                _ => 0, // Return 0 on timeout or error
-                            };
-
-                            let pending_count = match tokio::time::timeout(
-                                std::time::Duration::from_millis(500),
-                                pending_count_future,
-                            )
-                            .await
-                            {
-                                Ok(Ok(count)) => count,
-                                _ => 0, // Return 0 on timeout or error
-                            };
-
-                            let connected = engine_for_stdin.is_connected();
-                            println!(
+                        Some(&"STATUS") => match daemon_status(&engine_for_stdin).await {
+                            Some((doc_count, pending_count, connected)) => println!(
                                 "RESPONSE:STATUS:{}:{}:{}",
                                 doc_count, pending_count, connected
-                            );
-                        }
+                            ),
+                            None => println!("RESPONSE:ERROR:Status unavailable"),
+                        },
                         Some(&"LIST") => match engine_for_stdin.get_all_documents().await {
                             Ok(docs) => {
+                                // Emit the whole listing in one write so the
+                                // status watcher cannot interleave lines
+                                // between the DOC lines and LIST_END
+                                let mut frame = String::new();
                                 for doc in docs {
                                     let title = doc
                                         .content
                                         .get("title")
                                         .and_then(|v| v.as_str())
                                         .unwrap_or("No title");
-                                    println!("RESPONSE:DOC:{}:{}", doc.id, title);
+                                    frame.push_str(&format!("RESPONSE:DOC:{}:{}\n", doc.id, title));
                                 }
-                                println!("RESPONSE:LIST_END");
+                                frame.push_str("RESPONSE:LIST_END\n");
+                                print!("{}", frame);
                             }
                             Err(e) => println!("RESPONSE:ERROR:List failed: {}", e),
                         },
+                        Some(&"AWAIT_DOC") => match parts.get(1).map(|id| Uuid::parse_str(id)) {
+                            // Block until the document has synced in, then answer
+                            // with the status so a driver needs one round trip
+                            // instead of sleeping and following up with LIST/STATUS.
+                            // The wait runs in its own task so STATUS, LIST and
+                            // QUIT are still served meanwhile
+                            Some(Ok(doc_id)) => {
+                                let timeout_secs =
+                                    parts.get(2).and_then(|s| s.parse().ok()).unwrap_or(5);
+                                let engine = engine_for_stdin.clone();
+                                tokio::spawn(async move {
+                                    let timeout = std::time::Duration::from_secs(timeout_secs);
+                                    if !engine.wait_for_document(doc_id, timeout).await {
+                                        println!("RESPONSE:ERROR:Await timeout: {}", doc_id);
+                                        return;
+                                    }
+                                    match daemon_status(&engine).await {
+                                        Some((doc_count, pending_count, connected)) => println!(
+                                            "RESPONSE:DOC_PRESENT:{}:{}:{}:{}",
+                                            doc_id, doc_count, pending_count, connected
+                                        ),
+                                        None => println!("RESPONSE:ERROR:Status unavailable"),
+                                    }
+                                });
+                            }
+                            Some(Err(_)) => println!("RESPONSE:ERROR:Invalid document ID"),
+                            None => {
+                                println!("RESPONSE:ERROR:AWAIT_DOC requires doc_id[:timeout_secs]")
+                            }
+                        },
                         _ => {
                             println!("RESPONSE:ERROR:Unknown command: {}", line);
                         }
@@ -370,16 +327,309 @@ async fn main() -> Result<(), Box<dyn std::error::Error>> {
                 info!("Stdin processing task exiting");
             });
 
-            // Wait for the stdin task to complete
+            // Wait for the stdin task to complete, then stop polling status
             let _ = stdin_task.await;
+            status_task.abort();
             info!("Daemon mode exiting");
         }
 
+        "batch" => {
+            // Parse everything up front so a bad step fails before any work is done
+            let script = match script {
+                Some(script) => script,
+                None => std::io::read_to_string(std::io::stdin())?,
+            };
+            for op in parse_script(&script)? {
+                run_action(&engine, &database_path, &user_email, &op).await?;
+            }
+        }
+
         _ => {
-            eprintln!("Unknown action: {}", action);
+            let op = Operation {
+                action: action.clone(),
+                doc_id,
+                title,
+                description,
+            };
+            run_action(&engine, &database_path, &user_email, &op).await?;
+        }
+    }
+
+    Ok(())
+}
+
+/// Document count, pending sync count and connection state
+type DaemonStatus = (usize, usize, bool);
+
+/// EVENT lines for a status change, empty when nothing changed. Connection
+/// changes and the pending queue draining while online get their own line
+/// after EVENT:STATUS; the first status only reports EVENT:STATUS
+fn status_events(last: Option<DaemonStatus>, status: DaemonStatus) -> String {
+    if last == Some(status) {
+        return String::new();
+    }
+    let (doc_count, pending_count, connected) = status;
+    let mut events = format!(
+        "EVENT:STATUS:{}:{}:{}\n",
+        doc_count, pending_count, connected
+    );
+    if let Some((_, last_pending, last_connected)) = last {
+        if connected != last_connected {
+            events.push_str(if connected {
+                "EVENT:CONNECTED\n"
+            } else {
+                "EVENT:DISCONNECTED\n"
+            });
+        }
+        if connected && pending_count == 0 && last_pending > 0 {
+            events.push_str(&format!("EVENT:SYNCED:{}\n", doc_count));
+        }
+    }
+    events
+}
+
+/// Status for daemon STATUS frames, or None if either count timed out or failed
+async fn daemon_status(engine: &Client) -> Option<DaemonStatus> {
+    // Use timeouts to prevent blocking during reconnection
+    let doc_count = tokio::time::timeout(
+        std::time::Duration::from_millis(500),
+        engine.count_documents(),
+    )
+    .await
+    .ok()?
+    .ok()?;
+
+    let pending_count = tokio::time::timeout(
+        std::time::Duration::from_millis(500),
+        engine.count_pending_sync(),
+    )
+    .await
+    .ok()?
+    .ok()?;
+
+    Some((doc_count, pending_count, engine.is_connected()))
+}
+
+/// Wait until nothing is left to upload, for at most the 500ms that used to be
+/// slept unconditionally after each write; offline clients return immediately
+async fn wait_for_uploads(engine: &Client) {
+    let deadline = std::time::Instant::now() + std::time::Duration::from_millis(500);
+    while engine.is_connected() && std::time::Instant::now() < deadline {
+        if let Ok(0) = engine.count_pending_sync().await {
+            break;
+        }
+        tokio::time::sleep(std::time::Duration::from_millis(20)).await;
+    }
+}
+
+/// A single client operation, taken from the command line or a `batch` script
+struct Operation {
+    action: String,
+    doc_id: Option<Uuid>,
+    title: String,
+    description: String,
+}
+
+/// Parse and check a `batch` script such as `create:title=Task,desc=Details|sync|status`;
+/// steps may be separated by `|` or newlines, so values cannot contain `|`,
+/// newlines, `:` or `,`
+fn parse_script(script: &str) -> Result<Vec<Operation>, Box<dyn std::error::Error>> {
+    let mut ops = Vec::new();
+    for step in script
+        .split(['|', '\n'])
+        .map(str::trim)
+        .filter(|s| !s.is_empty())
+    {
+        let (action, params) = step.split_once(':').unwrap_or((step, ""));
+        let mut op = Operation {
+            action: action.to_string(),
+            doc_id: None,
+            title: String::new(),
+            description: String::new(),
+        };
+        for param in params.split(',').filter(|p| !p.is_empty()) {
+            match param.split_once('=') {
+                Some(("id", value)) => op.doc_id = Some(Uuid::parse_str(value)?),
+                Some(("title", value)) => op.title = value.to_string(),
+                Some(("desc", value)) => op.description = value.to_string(),
+                _ => return Err(format!("Invalid batch parameter: {}", param).into()),
+            }
+        }
+        match op.action.as_str() {
+            "create" | "update" if op.title.is_empty() => {
+                return Err(format!("Batch step '{}' requires title=", step).into())
+            }
+            "update" | "delete" if op.doc_id.is_none() => {
+                return Err(format!("Batch step '{}' requires id=", step).into())
+            }
+            "create" | "update" | "delete" | "list" | "sync" | "status" => {}
+            _ => return Err(format!("Unknown batch action: {}", op.action).into()),
+        }
+        ops.push(op);
+    }
+    Ok(ops)
+}
+
+async fn run_action(
+    engine: &Client,
+    database_path: &str,
+    user_email: &str,
+    op: &Operation,
+) -> Result<(), Box<dyn std::error::Error>> {
+    match op.action.as_str() {
+        "create" => {
+            if op.title.is_empty() {
+                eprintln!("--title is required for create");
+                std::process::exit(1);
+            }
+
+            let content = json!({
+                "title": op.title,
+                "description": op.description
+            });
+
+            debug!("Creating document with content: {:?}", content);
+            let document = engine.create_document(content).await?;
+            info!("Successfully created document: {}", document.id);
+            println!("Created document: {}", document.id);
+
+            // Let the immediate sync finish before disconnecting
+            wait_for_uploads(engine).await;
+        }
+
+        "update" => {
+            let id = op.doc_id.ok_or("--id is required for update")?;
+            if op.title.is_empty() {
+                eprintln!("--title is required for update");
+                std::process::exit(1);
+            }
+
+            let content = json!({
+                "title": op.title,
+                "description": op.description
+            });
+
+            debug!("Updating document {} with content: {:?}", id, content);
+            engine.update_document(id, content).await?;
+
+            // Let the immediate sync finish before disconnecting
+            wait_for_uploads(engine).await;
+            info!("Successfully updated document: {}", id);
+            println!("Updated document: {}", id);
+        }
+
+        "delete" => {
+            let id = op.doc_id.ok_or("--id is required for delete")?;
+            engine.delete_document(id).await?;
+
+            // Let the immediate sync finish before disconnecting
+            wait_for_uploads(engine).await;
+            println!("Deleted document: {}", id);
+        }
+
+        "list" => {
+            let documents = engine.get_all_documents().await?;
+            if documents.is_empty() {
+                println!("No documents found");
+            } else {
+                for doc in documents {
+                    let title = doc
+                        .content
+                        .get("title")
+                        .and_then(|v| v.as_str())
+                        .unwrap_or("No title");
+                    let desc = doc
+                        .content
+                        .get("description")
+                        .and_then(|v| v.as_str())
+                        .unwrap_or("");
+
+                    println!(
+                        "Document: {} | Title: {} | Description: {}",
+                        doc.id, title, desc
+                    );
+                }
+            }
+        }
+
+        "sync" => {
+            info!("Starting sync_all operation");
+            let start = std::time::Instant::now();
+            engine.sync_all().await?;
+            let elapsed = start.elapsed();
+            info!("Sync completed in {:?}", elapsed);
+
+            // Allow time for sync messages to complete before disconnecting
+            tokio::time::sleep(std::time::Duration::from_millis(500)).await;
+            println!("Sync completed");
+        }
+
+        "status" => {
+            let documents = engine.get_all_documents().await?;
+            println!("Database: {}", database_path);
+            println!("User: {}", user_email);
+            println!("Documents: {}", documents.len());
+
+            for doc in documents {
+                let title = doc
+                    .content
+                    .get("title")
+                    .and_then(|v| v.as_str())
+                    .unwrap_or("No title");
+
+                println!("  {} | {}", doc.id, title);
+            }
+
+            // Allow extra time for potential incoming sync messages (like auto-sync after reconnection)
+            info!("Waiting for potential incoming sync updates...");
+            tokio::time::sleep(std::time::Duration::from_millis(1000)).await;
+        }
+
+        _ => {
+            eprintln!("Unknown action: {}", op.action);
             std::process::exit(1);
         }
     }
 
     Ok(())
 }
+
+#[cfg(test)]
+mod tests {
+    use super::status_events;
+
+    #[test]
+    fn test_first_status_only_reports_status() {
+        assert_eq!(status_events(None, (2, 1, true)), "EVENT:STATUS:2:1:true\n");
+    }
+
+    #[test]
+    fn test_unchanged_status_emits_nothing() {
+        assert_eq!(status_events(Some((2, 0, true)), (2, 0, true)), "");
+    }
+
+    #[test]
+    fn test_connection_changes() {
+        assert_eq!(
+            status_events(Some((2, 0, true)), (2, 0, false)),
+            "EVENT:STATUS:2:0:false\nEVENT:DISCONNECTED\n"
+        );
+        assert_eq!(
+            status_events(Some((2, 0, false)), (2, 0, true)),
+            "EVENT:STATUS:2:0:true\nEVENT:CONNECTED\n"
+        );
+    }
+
+    #[test]
+    fn test_synced_when_pending_drains_online() {
+        assert_eq!(
+            status_events(Some((3, 2, false)), (3, 0, true)),
+            "EVENT:STATUS:3:0:true\nEVENT:CONNECTED\nEVENT:SYNCED:3\n"
+        );
+        // Draining while offline is not a sync
+        assert_eq!(
+            status_events(Some((3, 2, false)), (3, 0, false)),
+            "EVENT:STATUS:3:0:false\n"
+        );
+    }
+}
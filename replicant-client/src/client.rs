@@ -1,4 +1,9 @@
-use crate::{database::ClientDatabase, events::EventDispatcher, websocket::WebSocketClient};
+use crate::{
+    database::{ClientDatabase, ClientDatabaseOptions},
+    events::EventDispatcher,
+    websocket::WebSocketClient,
+};
+use backon::{BackoffBuilder, ExponentialBuilder};
 use replicant_core::{
     errors::ClientError,
     models::{Document, SyncStatus},
@@ -18,6 +23,21 @@ use uuid::Uuid;
 
 // Ping intervals for heartbeat detection
 const PING_INTERVAL: Duration = Duration::from_secs(10); // Send ping every 10 seconds
+                                                         // How often the reconnection monitor checks a live connection; also the cap on
+                                                         // the delay between failed reconnection attempts
+const RECONNECTION_INTERVAL: Duration = Duration::from_secs(5);
+
+/// Delays between failed reconnection attempts: from 250ms up to the regular
+/// interval, with jitter so clients of a restarted server don't all retry in
+/// lockstep. A fresh sequence is started after every successful connection
+fn reconnect_backoff() -> backon::ExponentialBackoff {
+    ExponentialBuilder::default()
+        .with_min_delay(Duration::from_millis(250))
+        .with_max_delay(RECONNECTION_INTERVAL)
+        .without_max_times()
+        .with_jitter()
+        .build()
+}
 
 #[derive(Debug, Clone)]
 struct PendingUpload {
@@ -63,7 +83,27 @@ impl Client {
         api_key: &str,
         api_secret: &str,
     ) -> SyncResult<Self> {
-        let db = Arc::new(ClientDatabase::new(database_url).await?);
+        Self::new_with_db_options(
+            database_url,
+            server_url,
+            email,
+            api_key,
+            api_secret,
+            ClientDatabaseOptions::default(),
+        )
+        .await
+    }
+
+    /// Like `new`, with SQLite tuning for the local database
+    pub async fn new_with_db_options(
+        database_url: &str,
+        server_url: &str,
+        email: &str,
+        api_key: &str,
+        api_secret: &str,
+        db_options: ClientDatabaseOptions,
+    ) -> SyncResult<Self> {
+        let db = Arc::new(ClientDatabase::new_with_options(database_url, db_options).await?);
         db.run_migrations().await?;
 
         // Ensure user_config exists with deterministic user ID based on email
@@ -587,14 +627,25 @@ impl Client {
         Ok(docs)
     }
 
+    /// Wait until a document is present locally, whether created here or
+    /// synced in; returns false if the timeout passes first
+    pub async fn wait_for_document(&self, id: Uuid, timeout: Duration) -> bool {
+        let poll = async {
+            // Look up the one row rather than loading every document per poll
+            while !matches!(self.db.document_exists(&id).await, Ok(true)) {
+                tokio::time::sleep(Duration::from_millis(50)).await;
+            }
+        };
+        tokio::time::timeout(timeout, poll).await.is_ok()
+    }
+
+    // Both counts run as COUNT(*) queries, so callers can poll them cheaply
     pub async fn count_documents(&self) -> SyncResult<usize> {
-        let docs = self.db.get_all_documents().await?;
-        Ok(docs.len())
+        Ok(self.db.count_documents().await? as usize)
     }
 
     pub async fn count_pending_sync(&self) -> SyncResult<usize> {
-        let pending_docs = self.db.get_pending_documents().await?;
-        Ok(pending_docs.len())
+        Ok(self.db.count_pending_documents().await? as usize)
     }
 
     async fn sync_pending_documents(&self) -> SyncResult<()> {
@@ -1572,16 +1623,18 @@ impl Client {
         let deferred_messages = self.deferred_messages.clone();
 
         tracing::info!(
-            "🔄 CLIENT {}: Starting continuous reconnection monitor (5-second intervals)",
-            client_id
+            "🔄 CLIENT {}: Starting continuous reconnection monitor (checks every {:?}, retries back off from 250ms)",
+            client_id,
+            RECONNECTION_INTERVAL
         );
 
         tokio::spawn(async move {
-            const RECONNECTION_INTERVAL: std::time::Duration = std::time::Duration::from_secs(5);
             let mut connection_attempts = 0;
+            let mut retry_delays = reconnect_backoff();
 
             loop {
                 let currently_connected = is_connected.load(Ordering::Relaxed);
+                let mut next_check = RECONNECTION_INTERVAL;
 
                 if !currently_connected {
                     connection_attempts += 1;
@@ -1611,6 +1664,7 @@ impl Client {
                                 connection_attempts
                             );
                             connection_attempts = 0;
+                            retry_delays = reconnect_backoff();
 
                             // Update the client
                             *ws_client.lock().await = Some(new_client);
@@ -1714,7 +1768,11 @@ impl Client {
                             // The pending sync handler will request full sync after uploads complete
                         }
                         Err(e) => {
-                            tracing::debug!("❌ CLIENT {}: Connection attempt #{} failed: {} - will retry in {}s", client_id, connection_attempts, e, RECONNECTION_INTERVAL.as_secs());
+                            next_check = retry_delays
+                                .next()
+                                .unwrap_or(RECONNECTION_INTERVAL)
+                                .min(RECONNECTION_INTERVAL);
+                            tracing::debug!("❌ CLIENT {}: Connection attempt #{} failed: {} - will retry in {:?}", client_id, connection_attempts, e, next_check);
                             event_dispatcher.emit_connection_attempted(&server_url);
                         }
                     }
@@ -1786,7 +1844,7 @@ impl Client {
                 }
 
                 // Wait before next check/retry
-                tokio::time::sleep(RECONNECTION_INTERVAL).await;
+                tokio::time::sleep(next_check).await;
             }
         });
     }
@@ -1950,3 +2008,36 @@ impl Client {
         Ok(())
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_reconnect_backoff_starts_short_and_caps_at_interval() {
+        let delays: Vec<Duration> = reconnect_backoff().take(20).collect();
+
+        assert_eq!(delays.len(), 20, "backoff should never run out");
+        // Jitter adds at most one more delay's worth
+        assert!(delays[0] <= Duration::from_millis(500), "{:?}", delays[0]);
+        // The monitor clamps to the interval, so check the schedule reaches it
+        let capped: Vec<Duration> = delays
+            .iter()
+            .map(|d| (*d).min(RECONNECTION_INTERVAL))
+            .collect();
+        assert!(capped.iter().all(|d| *d <= RECONNECTION_INTERVAL));
+        assert!(capped[10..].iter().all(|d| *d >= RECONNECTION_INTERVAL / 2));
+    }
+
+    #[test]
+    fn test_reconnect_backoff_restarts_after_success() {
+        let mut delays = reconnect_backoff();
+        for _ in 0..10 {
+            delays.next();
+        }
+
+        // A successful connection starts a fresh sequence
+        let mut delays = reconnect_backoff();
+        assert!(delays.next().unwrap() <= Duration::from_millis(500));
+    }
+}
@@ -5,7 +5,12 @@ use replicant_core::{
     models::{Document, SyncStatus},
     SyncResult,
 };
-use sqlx::{sqlite::SqlitePoolOptions, Row, SqlitePool};
+use sqlx::{
+    sqlite::{SqliteConnectOptions, SqliteJournalMode, SqlitePoolOptions, SqliteSynchronous},
+    Row, SqlitePool,
+};
+use std::str::FromStr;
+use std::sync::OnceLock;
 use uuid::Uuid;
 
 #[derive(Debug, Clone, PartialEq)]
@@ -14,15 +19,70 @@ pub struct PendingDocumentInfo {
     pub is_deleted: bool,
 }
 
+/// SQLite tuning applied to every pooled connection.
+///
+/// The default leaves the database URL's own settings untouched, which is what
+/// `ClientDatabase::new` uses.
+#[derive(Debug, Clone, Default)]
+pub struct ClientDatabaseOptions {
+    /// Use journal_mode=WAL with synchronous=NORMAL, so readers proceed during
+    /// sync writes and commits fsync only at checkpoints. Changes the durability
+    /// of the last commits on power loss; ignored by in-memory databases.
+    pub wal: bool,
+    /// Page cache size per connection in KiB (SQLite's default is about 2 MB)
+    pub cache_size_kib: Option<u32>,
+    /// Keep sorts and temporary b-trees in memory (temp_store=MEMORY)
+    pub memory_temp_store: bool,
+    /// Bytes of the database file to read through mmap (mmap_size)
+    pub mmap_size: Option<u64>,
+}
+
+impl ClientDatabaseOptions {
+    /// Tuning for clients that sync many small writes to an on-disk database,
+    /// as the test clients do
+    pub fn tuned() -> Self {
+        Self {
+            wal: true,
+            cache_size_kib: Some(20_000), // ~20 MB page cache per connection
+            memory_temp_store: true,
+            mmap_size: Some(256 * 1024 * 1024),
+        }
+    }
+}
+
 pub struct ClientDatabase {
     pub pool: SqlitePool,
 }
 
 impl ClientDatabase {
     pub async fn new(database_url: &str) -> SyncResult<Self> {
+        Self::new_with_options(database_url, ClientDatabaseOptions::default()).await
+    }
+
+    pub async fn new_with_options(
+        database_url: &str,
+        db_options: ClientDatabaseOptions,
+    ) -> SyncResult<Self> {
+        let mut options = SqliteConnectOptions::from_str(database_url)?;
+        if db_options.wal {
+            options = options
+                .journal_mode(SqliteJournalMode::Wal)
+                .synchronous(SqliteSynchronous::Normal);
+        }
+        if let Some(kib) = db_options.cache_size_kib {
+            // Negative values are KiB rather than pages
+            options = options.pragma("cache_size", format!("-{}", kib));
+        }
+        if db_options.memory_temp_store {
+            options = options.pragma("temp_store", "MEMORY");
+        }
+        if let Some(bytes) = db_options.mmap_size {
+            options = options.pragma("mmap_size", bytes.to_string());
+        }
+
         let pool = SqlitePoolOptions::new()
             .max_connections(5)
-            .connect(database_url)
+            .connect_with(options)
             .await?;
 
         Ok(Self { pool })
@@ -97,8 +157,11 @@ impl ClientDatabase {
         // Create a two-level namespace hierarchy:
         // 1. DNS namespace -> Application namespace (using APP_ID)
         // 2. Application namespace -> User ID (using user identifier)
-        let app_namespace = Uuid::new_v5(&Uuid::NAMESPACE_DNS, APP_ID.as_bytes());
-        Uuid::new_v5(&app_namespace, user_identifier.as_bytes())
+        // The application namespace never changes, so it is only hashed once
+        static APP_NAMESPACE: OnceLock<Uuid> = OnceLock::new();
+        let app_namespace =
+            APP_NAMESPACE.get_or_init(|| Uuid::new_v5(&Uuid::NAMESPACE_DNS, APP_ID.as_bytes()));
+        Uuid::new_v5(app_namespace, user_identifier.as_bytes())
     }
 
     pub async fn get_user_id(&self) -> SyncResult<Uuid> {
@@ -183,6 +246,14 @@ impl ClientDatabase {
         Ok(())
     }
 
+    pub async fn count_pending_documents(&self) -> SyncResult<i64> {
+        let count: i64 = sqlx::query_scalar("SELECT COUNT(*) FROM documents WHERE sync_status = ?")
+            .bind(SyncStatus::Pending.to_string())
+            .fetch_one(&self.pool)
+            .await?;
+        Ok(count)
+    }
+
     pub async fn get_pending_documents(&self) -> SyncResult<Vec<PendingDocumentInfo>> {
         tracing::info!("DATABASE: 🔍 Querying for pending documents...");
         let rows = sqlx::query(Queries::GET_PENDING_DOCUMENTS)
@@ -283,6 +354,16 @@ impl ClientDatabase {
             .map(|row| DbHelpers::parse_document(&row))
             .collect()
     }
+    pub async fn document_exists(&self, id: &Uuid) -> SyncResult<bool> {
+        let exists: i64 = sqlx::query_scalar(
+            "SELECT EXISTS(SELECT 1 FROM documents WHERE id = ?1 AND deleted_at IS NULL)",
+        )
+        .bind(id.to_string())
+        .fetch_one(&self.pool)
+        .await?;
+        Ok(exists != 0)
+    }
+
     pub async fn count_documents(&self) -> SyncResult<i64> {
         let count: i64 =
             sqlx::query_scalar("SELECT COUNT(*) FROM documents WHERE deleted_at IS NULL")
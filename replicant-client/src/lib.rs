@@ -13,7 +13,7 @@ pub mod ffi;
 pub mod ffi_test;
 
 pub use client::Client;
-pub use database::ClientDatabase;
+pub use database::{ClientDatabase, ClientDatabaseOptions};
 pub use websocket::WebSocketClient;
 
 #[cfg(test)]
@@ -0,0 +1,49 @@
+use replicant_client::{ClientDatabase, ClientDatabaseOptions};
+use sqlx::Row;
+
+/// A fresh on-disk database URL; in-memory databases ignore journal_mode
+fn temp_db_url(name: &str) -> String {
+    let path = format!(
+        "/tmp/replicant_db_options_{}_{}.db",
+        name,
+        std::process::id()
+    );
+    for suffix in ["", "-wal", "-shm"] {
+        let _ = std::fs::remove_file(format!("{}{}", path, suffix));
+    }
+    format!("sqlite:{}?mode=rwc", path)
+}
+
+async fn pragma(db: &ClientDatabase, name: &str) -> String {
+    let row = sqlx::query(&format!("PRAGMA {}", name))
+        .fetch_one(&db.pool)
+        .await
+        .unwrap();
+    // journal_mode answers with text, the numeric pragmas with integers
+    row.try_get::<String, _>(0)
+        .unwrap_or_else(|_| row.get::<i64, _>(0).to_string())
+}
+
+#[tokio::test]
+async fn test_default_options_keep_sqlite_defaults() {
+    let db = ClientDatabase::new(&temp_db_url("default")).await.unwrap();
+
+    assert_eq!(pragma(&db, "journal_mode").await, "delete");
+    assert_eq!(pragma(&db, "temp_store").await, "0");
+}
+
+#[tokio::test]
+async fn test_tuned_options_apply_pragmas() {
+    let db =
+        ClientDatabase::new_with_options(&temp_db_url("tuned"), ClientDatabaseOptions::tuned())
+            .await
+            .unwrap();
+
+    assert_eq!(pragma(&db, "journal_mode").await, "wal");
+    // synchronous=NORMAL is 1
+    assert_eq!(pragma(&db, "synchronous").await, "1");
+    assert_eq!(pragma(&db, "cache_size").await, "-20000");
+    // temp_store=MEMORY is 2
+    assert_eq!(pragma(&db, "temp_store").await, "2");
+    assert_eq!(pragma(&db, "mmap_size").await, "268435456");
+}
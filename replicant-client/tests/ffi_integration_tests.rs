@@ -164,8 +164,11 @@ unsafe fn create_test_engine() -> *mut Replicant {
         std::process::id(),
         unique_id
     );
-    // Clean up any existing database file
-    let _ = std::fs::remove_file(&test_db_path);
+    // Clean up any existing database file, including WAL sidecars that would
+    // otherwise be replayed into the fresh database
+    for suffix in ["", "-wal", "-shm"] {
+        let _ = std::fs::remove_file(format!("{}{}", test_db_path, suffix));
+    }
 
     let db_url = CString::new(format!("sqlite:{}?mode=rwc", test_db_path)).unwrap();
     let server_url = CString::new("ws://localhost:8080/ws").unwrap();
@@ -452,6 +452,45 @@ async fn test_client_reconnect_sync_document_online() {
     assert_eq!(setup.engine.get_all_documents().await.unwrap().len(), 0);
 }
 
+/// Failed reconnection attempts back off from 250ms, so a server that comes up
+/// shortly after the client is reached well before the 5s monitor interval
+#[tokio::test]
+async fn test_reconnect_backoff_reaches_late_server_quickly() {
+    let db_id = Uuid::new_v4();
+    let db_url = format!("file:{}?mode=memory&cache=shared", db_id);
+    // Keep a connection open so the shared in-memory database survives
+    let db = ClientDatabase::new(&db_url).await.unwrap();
+    db.run_migrations().await.unwrap();
+
+    // Nothing listens on the port yet, so the first attempts fail
+    let mut server = MockServer::new().await;
+    let engine = Client::new(
+        &db_url,
+        &format!("ws://{}", server.addr),
+        "test@user.com",
+        "test-key",
+        "test-secret",
+    )
+    .await
+    .unwrap();
+    assert!(!engine.is_connected());
+
+    // Start the server after the first monitor attempt (and its own connect
+    // retries) has failed; a fixed 5s interval would not retry until ~6s
+    tokio::time::sleep(Duration::from_millis(2500)).await;
+    let started = std::time::Instant::now();
+    server.start().await;
+
+    // expect_client_message allows 2s, well under a fixed 5s retry
+    let auth_msg = server.expect_client_message().await;
+    assert!(matches!(auth_msg, ClientMessage::Authenticate { .. }));
+    assert!(
+        started.elapsed() < Duration::from_secs(3),
+        "Reconnected after {:?}",
+        started.elapsed()
+    );
+}
+
 /// Test server sync overwrite protection during upload phase
 #[tokio::test]
 async fn test_sync_protection_mode_blocks_server_updates() {
@@ -1267,6 +1306,57 @@ async fn test_server_sends_new_document_created() {
     println!("✅ SERVER CREATE TEST: Received and stored DocumentCreated from server");
 }
 
+/// Tests wait_for_document, which backs the daemon's AWAIT_DOC command
+#[tokio::test]
+async fn test_wait_for_document_present_and_timeout() {
+    let mut setup = setup().await;
+    let _ = setup.server.expect_client_message().await; // auth
+    let _ = setup.server.expect_client_message().await; // sync
+
+    // Timeout path: nothing ever delivers this document
+    let started = std::time::Instant::now();
+    let missing = setup
+        .engine
+        .wait_for_document(Uuid::new_v4(), Duration::from_millis(200))
+        .await;
+    assert!(
+        !missing,
+        "Should time out for a document that never arrives"
+    );
+    assert!(started.elapsed() < Duration::from_secs(2));
+
+    // Present path: the document arrives from the server while waiting
+    let (user_id, _) = setup.db.get_user_and_client_id().await.unwrap();
+    let new_doc = replicant_core::models::Document {
+        id: Uuid::new_v4(),
+        user_id,
+        content: json!({ "from_server": true }),
+        sync_revision: 1,
+        content_hash: None,
+        title: None,
+        created_at: chrono::Utc::now(),
+        updated_at: chrono::Utc::now(),
+        deleted_at: None,
+    };
+    let (wait, _) = tokio::join!(
+        setup
+            .engine
+            .wait_for_document(new_doc.id, Duration::from_secs(5)),
+        async {
+            tokio::time::sleep(Duration::from_millis(100)).await;
+            setup
+                .server
+                .send_server_message(ServerMessage::DocumentCreated {
+                    document: new_doc.clone(),
+                })
+                .await;
+        }
+    );
+    assert!(wait, "Should see the document once the server sends it");
+
+    println!("✅ WAIT FOR DOCUMENT TEST: Timed out when missing, returned once synced in");
+}
+
 /// Tests server sending DocumentDeleted
 #[tokio::test]
 async fn test_server_sends_document_deleted() {
@@ -19,6 +19,8 @@ pub struct ChangeEventParams<'a> {
 pub struct ServerDatabase {
     pub pool: PgPool,
     pub app_namespace_id: String,
+    // UUID v5 namespace derived from app_namespace_id, computed once per database
+    app_namespace: Uuid,
 }
 
 impl ServerDatabase {
@@ -40,6 +42,7 @@ impl ServerDatabase {
 
         Ok(Self {
             pool,
+            app_namespace: Uuid::new_v5(&Uuid::NAMESPACE_DNS, app_namespace_id.as_bytes()),
             app_namespace_id,
         })
     }
@@ -58,6 +61,7 @@ impl ServerDatabase {
 
         Ok(Self {
             pool,
+            app_namespace: Uuid::new_v5(&Uuid::NAMESPACE_DNS, app_namespace_id.as_bytes()),
             app_namespace_id,
         })
     }
@@ -70,8 +74,7 @@ impl ServerDatabase {
     pub async fn create_user(&self, email: &str) -> SyncResult<Uuid> {
         // Generate deterministic user ID using UUID v5
         // This MUST match the client's logic in ClientDatabase::generate_deterministic_user_id
-        let app_namespace = Uuid::new_v5(&Uuid::NAMESPACE_DNS, self.app_namespace_id.as_bytes());
-        let user_id = Uuid::new_v5(&app_namespace, email.as_bytes());
+        let user_id = Uuid::new_v5(&self.app_namespace, email.as_bytes());
 
         let row = sqlx::query!(
             r#"
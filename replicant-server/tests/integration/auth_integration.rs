@@ -1,4 +1,5 @@
 use crate::integration::helpers::*;
+use futures_util::future;
 use serde_json::json;
 
 crate::integration_test!(
@@ -175,26 +176,30 @@ crate::integration_test!(
             .await
             .expect("Failed to create document 0");
 
-        // Create remaining clients and documents
+        // Create remaining clients and documents; the sessions are independent,
+        // so connect them all at once
         let mut clients = vec![client0];
 
-        for i in 1..5 {
-            // Small delay between client connections
-            tokio::time::sleep(tokio::time::Duration::from_millis(100)).await;
-
-            let client = ctx
-                .create_test_client(email, user_id, &api_key, &api_secret)
-                .await
-                .expect(&format!("Failed to create client {}", i));
+        let (ctx, api_key, api_secret) = (&ctx, &api_key, &api_secret);
+        clients.extend(
+            future::join_all((1..5).map(|i| async move {
+                let client = ctx
+                    .create_test_client(email, user_id, api_key, api_secret)
+                    .await
+                    .expect(&format!("Failed to create client {}", i));
 
-            // Create document for this client
-            let _doc = client
-                .create_document(json!({"title": format!("Doc from client {}", i), "test": true}))
-                .await
-                .expect(&format!("Failed to create document {}", i));
+                // Create document for this client
+                let _doc = client
+                    .create_document(
+                        json!({"title": format!("Doc from client {}", i), "test": true}),
+                    )
+                    .await
+                    .expect(&format!("Failed to create document {}", i));
 
-            clients.push(client);
-        }
+                client
+            }))
+            .await,
+        );
 
         // Test for eventual convergence - all clients should eventually see all documents
         // We're testing distributed systems, so we allow reasonable time for convergence
@@ -50,9 +50,6 @@ crate::integration_test!(
                     .await
                     .unwrap();
 
-                // Wait for automatic sync
-                tokio::time::sleep(tokio::time::Duration::from_millis(100)).await;
-
                 client
             });
 
@@ -66,23 +63,9 @@ crate::integration_test!(
             .filter_map(Result::ok)
             .collect();
 
-        // Give time for all syncs to propagate
-        tokio::time::sleep(tokio::time::Duration::from_secs(2)).await;
-
-        // Wait for final sync to complete
-        tokio::time::sleep(tokio::time::Duration::from_secs(1)).await;
-
-        // All clients should see all documents
-        for (i, client) in clients.iter().enumerate() {
-            let docs = client.get_all_documents().await.unwrap();
-            assert_eq!(
-                docs.len(),
-                client_count,
-                "Client {} should see all {} documents",
-                i,
-                client_count
-            );
-        }
+        // All clients should see all documents, as soon as the syncs have propagated
+        let client_refs: Vec<_> = clients.iter().collect();
+        assert_all_clients_converge(&client_refs, client_count, 10, |_| async { true }).await;
     },
     true
 );
@@ -262,13 +245,12 @@ crate::integration_test!(
             .expect("Failed to create user");
 
         // Create multiple clients that connect and disconnect
+        let (ctx_ref, api_key_ref, api_secret_ref) = (&ctx, &api_key, &api_secret);
         for round in 0..5 {
-            let mut clients = Vec::new();
-
-            // Connect several clients
-            for i in 0..5 {
-                let client = ctx
-                    .create_test_client(email, user_id, &api_key, &api_secret)
+            // Connect several clients at once; each round's clients are independent
+            let clients = future::join_all((0..5).map(|i| async move {
+                let client = ctx_ref
+                    .create_test_client(email, user_id, api_key_ref, api_secret_ref)
                     .await
                     .expect("Failed to create client");
                 // Create a document
@@ -278,17 +260,28 @@ crate::integration_test!(
                     )
                     .await
                     .unwrap();
-                clients.push(client);
-            }
-
-            // Wait for automatic sync
-            tokio::time::sleep(tokio::time::Duration::from_millis(1000)).await;
+                client
+            }))
+            .await;
+
+            // Wait until every client has uploaded its document before dropping it
+            let client_refs: Vec<_> = clients.iter().collect();
+            let client_refs = &client_refs;
+            assert_eventually(
+                || async move {
+                    for client in client_refs {
+                        if client.count_pending_sync().await.unwrap_or(1) > 0 {
+                            return false;
+                        }
+                    }
+                    true
+                },
+                10,
+            )
+            .await;
 
             // Clients go out of scope and disconnect
             drop(clients);
-
-            // Small delay between rounds
-            tokio::time::sleep(tokio::time::Duration::from_millis(100)).await;
         }
 
         // Final client should see all documents
@@ -296,11 +289,8 @@ crate::integration_test!(
             .create_test_client(email, user_id, &api_key, &api_secret)
             .await
             .expect("Failed to create client");
-        // Wait for automatic sync
-        tokio::time::sleep(tokio::time::Duration::from_secs(1)).await;
-
-        let docs = final_client.get_all_documents().await.unwrap();
-        assert_eq!(docs.len(), 25); // 5 rounds * 5 clients
+        // 5 rounds * 5 clients
+        assert_all_clients_converge(&[&final_client], 25, 10, |_| async { true }).await;
     },
     true
 );
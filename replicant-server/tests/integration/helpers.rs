@@ -1,10 +1,11 @@
 use anyhow::{Context, Result};
 use hmac::{Hmac, Mac};
 use libc::kill;
-use replicant_client::Client as SyncClient;
+use replicant_client::{Client as SyncClient, ClientDatabaseOptions};
 use replicant_core::models::Document;
 use serde_json::json;
 use sha2::Sha256;
+use sqlx::postgres::{PgPool, PgPoolOptions};
 use std::sync::Arc;
 use std::time::Duration;
 use tokio::process::Child;
@@ -45,6 +46,9 @@ pub struct TestContext {
     pub server_url: String,
     pub db_url: String,
     pub server_process: Arc<Mutex<Option<Child>>>,
+    // Shared connection to the test database for seeding inserts, opened lazily
+    // and closed before the database is dropped or recreated
+    db_pool: Arc<Mutex<Option<PgPool>>>,
 }
 
 impl TestContext {
@@ -89,17 +93,35 @@ impl TestContext {
             server_url,
             db_url,
             server_process: Arc::new(Mutex::new(None)),
+            db_pool: Arc::new(Mutex::new(None)),
         }
     }
 
-    pub async fn generate_test_credentials(&self, name: &str) -> Result<(String, String)> {
-        // Connect to test database with minimal connection pool to avoid exhaustion
-        let pool = sqlx::postgres::PgPoolOptions::new()
-            .max_connections(1) // Only need 1 connection for this quick operation
-            .idle_timeout(std::time::Duration::from_secs(1))
+    async fn test_db_pool(&self) -> Result<PgPool> {
+        let mut cached = self.db_pool.lock().await;
+        if let Some(pool) = cached.as_ref() {
+            return Ok(pool.clone());
+        }
+
+        // One connection is plenty for the seeding inserts and keeps the
+        // per-test connection footprint small
+        let pool = PgPoolOptions::new()
+            .max_connections(1)
             .connect(&self.db_url)
             .await
             .context("Failed to connect to test database")?;
+        *cached = Some(pool.clone());
+        Ok(pool)
+    }
+
+    async fn close_test_db_pool(db_pool: &Mutex<Option<PgPool>>) {
+        if let Some(pool) = db_pool.lock().await.take() {
+            pool.close().await;
+        }
+    }
+
+    pub async fn generate_test_credentials(&self, name: &str) -> Result<(String, String)> {
+        let pool = self.test_db_pool().await?;
 
         // Generate credentials using AuthState's generate_api_credentials()
         use replicant_server::auth::AuthState;
@@ -114,20 +136,13 @@ impl TestContext {
             .await
             .context("Failed to save test credentials")?;
 
-        pool.close().await;
-
         Ok((credentials.api_key, credentials.secret))
     }
 
     pub async fn create_test_user(&self, email: &str) -> Result<Uuid> {
         // Create user directly in database (since REST endpoint was removed)
         // WebSocket auto-creation is the production flow, but tests need user_id upfront
-        let pool = sqlx::postgres::PgPoolOptions::new()
-            .max_connections(1) // Only need 1 connection for this quick operation
-            .idle_timeout(std::time::Duration::from_secs(1))
-            .connect(&self.db_url)
-            .await
-            .context("Failed to connect to test database")?;
+        let pool = self.test_db_pool().await?;
 
         let user_id = Uuid::new_v4();
         sqlx::query("INSERT INTO users (id, email) VALUES ($1, $2)")
@@ -137,7 +152,6 @@ impl TestContext {
             .await
             .context("Failed to insert test user")?;
 
-        pool.close().await;
         Ok(user_id)
     }
 
@@ -202,7 +216,11 @@ impl TestContext {
             let db_path = format!("file:memdb_{}?mode=memory&cache=shared", Uuid::new_v4());
 
             // Initialize the client database with the user
-            let db = replicant_client::ClientDatabase::new(&db_path).await?;
+            let db = replicant_client::ClientDatabase::new_with_options(
+                &db_path,
+                ClientDatabaseOptions::tuned(),
+            )
+            .await?;
             db.run_migrations().await?;
 
             // Generate a unique client_id for this test client
@@ -228,9 +246,13 @@ impl TestContext {
 
         // Create the engine without holding the semaphore
         // Connection starts automatically, no need to call start()
-        let engine = SyncClient::new(
-            &db_path, &ws_url, email, api_key,    // rpa_ prefixed key
+        let engine = SyncClient::new_with_db_options(
+            &db_path,
+            &ws_url,
+            email,
+            api_key,    // rpa_ prefixed key
             api_secret, // rps_ prefixed secret
+            ClientDatabaseOptions::tuned(),
         )
         .await?;
 
@@ -326,6 +348,18 @@ impl TestContext {
     pub async fn wait_for_server(&self) -> Result<()> {
         let start = std::time::Instant::now();
         let max_wait = Duration::from_secs(30);
+        let server_base = self
+            .server_url
+            .replace("ws://", "http://")
+            .replace("wss://", "https://");
+
+        // Bound each probe so a wedged connect can't eat the whole poll interval
+        let client = reqwest::Client::builder()
+            .timeout(Duration::from_millis(300))
+            .build()?;
+
+        // Exponential backoff: 25ms, 40ms, 64ms, ... capped at 500ms
+        let mut delay = Duration::from_millis(25);
 
         loop {
             if start.elapsed() > max_wait {
@@ -333,17 +367,11 @@ impl TestContext {
             }
 
             // Try to connect
-            match reqwest::get(
-                &self
-                    .server_url
-                    .replace("ws://", "http://")
-                    .replace("wss://", "https://"),
-            )
-            .await
-            {
+            match client.get(&server_base).send().await {
                 Ok(_) => return Ok(()),
                 Err(_) => {
-                    tokio::time::sleep(Duration::from_millis(500)).await;
+                    tokio::time::sleep(delay).await;
+                    delay = delay.mul_f32(1.6).min(Duration::from_millis(500));
                 }
             }
         }
@@ -434,16 +462,28 @@ impl TestContext {
         if let Some(mut child) = l.take() {
             if let Some(pid) = child.id() {
                 let _ = unsafe { kill(pid as i32, libc::SIGINT) };
-                child.wait().await.unwrap();
+
+                // Bound the graceful shutdown so a hung server can't stall the test
+                let timeout = Duration::from_secs(5);
+                if tokio::time::timeout(timeout, child.wait()).await.is_err() {
+                    tracing::warn!(
+                        "Server process {} didn't exit on SIGINT, force killing",
+                        pid
+                    );
+                    let _ = unsafe { kill(pid as i32, libc::SIGKILL) };
+                    let _ = child.wait().await;
+                }
                 tracing::info!("Killed server process: {:?}", pid);
             }
         }
-        tokio::time::sleep(Duration::from_millis(500)).await;
     }
 
     pub async fn recreate_database(&self) -> Result<()> {
         tracing::debug!("Recreating database for fresh state");
 
+        // Release our own connection first so DROP DATABASE doesn't wait on it
+        Self::close_test_db_pool(&self.db_pool).await;
+
         // Extract database name from URL
         let db_name = self
             .db_url
@@ -553,25 +593,39 @@ impl TestContext {
         };
 
         // Start the server in background
-        // Note: Using null() for stdout/stderr to ensure proper process cleanup
+        // Note: Using null() for stdout/stderr to ensure proper process cleanup;
+        // set SYNC_TEST_SERVER_LOGS=1 (or true) to see the server's debug output
         tracing::debug!(
             "Starting server on {} with database {}",
             bind_address,
             self.db_url
         );
+        let server_output = || {
+            if matches!(
+                std::env::var("SYNC_TEST_SERVER_LOGS").as_deref(),
+                Ok("1" | "true")
+            ) {
+                std::process::Stdio::inherit()
+            } else {
+                std::process::Stdio::null()
+            }
+        };
         let server = tokio::process::Command::new(SERVER_BIN)
             .current_dir(&project_root)
             .env("DATABASE_URL", &self.db_url)
             .env("BIND_ADDRESS", &bind_address)
             .env("RUST_LOG", "info,sync_client=debug,sync_server=debug")
-            .stdout(std::process::Stdio::inherit())
-            .stderr(std::process::Stdio::inherit())
+            .stdout(server_output())
+            .stderr(server_output())
+            // Don't leave the server running if the test unwinds before cleanup
+            .kill_on_drop(true)
             .spawn()?;
 
         let mut w = self.server_process.lock().await;
         *w = Some(server);
 
-        tokio::time::sleep(std::time::Duration::from_millis(2000)).await;
+        // No fixed settle delay: callers follow up with wait_for_server(), which
+        // returns as soon as the server is accepting requests
         Ok(())
     }
 }
@@ -580,6 +634,10 @@ impl Drop for TestContext {
     fn drop(&mut self) {
         let server_process = self.server_process.clone();
         let db_url = self.db_url.clone();
+        // Clones share the lazily created pool (and the database behind it), so
+        // only the last one to go may close it; checked before cloning below
+        let last_pool_owner = Arc::strong_count(&self.db_pool) == 1;
+        let db_pool = self.db_pool.clone();
 
         // handle any dangling process and cleanup database
         let handle = tokio::runtime::Handle::current();
@@ -612,6 +670,10 @@ impl Drop for TestContext {
             }
 
             // Drop the unique test database
+            if !last_pool_owner {
+                return;
+            }
+            TestContext::close_test_db_pool(&db_pool).await;
             if let Some(db_name) = db_url.split('/').last() {
                 if db_name.starts_with("sync_test_") {
                     let base_url = db_url
@@ -633,8 +695,10 @@ impl Drop for TestContext {
     }
 }
 
+/// Poll a condition until it holds or the timeout passes, reporting which without
+/// panicking, so the caller can follow up with assertions that say what failed
 #[allow(dead_code)]
-pub async fn assert_eventually<F, Fut>(f: F, timeout_secs: u64)
+pub async fn wait_until<F, Fut>(f: F, timeout_secs: u64) -> bool
 where
     F: Fn() -> Fut,
     Fut: std::future::Future<Output = bool>,
@@ -643,15 +707,26 @@ where
 
     while std::time::Instant::now() < deadline {
         if f().await {
-            return;
+            return true;
         }
         tokio::time::sleep(Duration::from_millis(100)).await;
     }
 
-    panic!(
-        "Assertion did not become true within {} seconds",
-        timeout_secs
-    );
+    false
+}
+
+#[allow(dead_code)]
+pub async fn assert_eventually<F, Fut>(f: F, timeout_secs: u64)
+where
+    F: Fn() -> Fut,
+    Fut: std::future::Future<Output = bool>,
+{
+    if !wait_until(f, timeout_secs).await {
+        panic!(
+            "Assertion did not become true within {} seconds",
+            timeout_secs
+        );
+    }
 }
 
 /// Test helper for verifying eventual convergence in distributed systems
@@ -30,18 +30,15 @@ crate::integration_test!(
 
         // Create three clients for the same user
         tracing::info!("Creating 3 clients for user {}", user_id);
-        let client1 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client 1");
-        let client2 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client 2");
-        let client3 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client 3");
+        // Clients are independent, so connect them concurrently
+        let (client1, client2, client3) = tokio::join!(
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+        );
+        let client1 = client1.expect("Failed to create client 1");
+        let client2 = client2.expect("Failed to create client 2");
+        let client3 = client3.expect("Failed to create client 3");
 
         // Give clients time to fully connect and sync
         sleep(Duration::from_millis(2000)).await;
@@ -391,15 +388,13 @@ crate::integration_test!(
             .await
             .expect("Failed to create user");
 
-        // Create two clients
-        let client1 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client 1");
-        let client2 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client 2");
+        // Create two clients concurrently
+        let (client1, client2) = tokio::join!(
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+        );
+        let client1 = client1.expect("Failed to create client 1");
+        let client2 = client2.expect("Failed to create client 2");
 
         sleep(Duration::from_millis(300)).await;
 
@@ -128,6 +128,28 @@ async fn create_client_with_event_tracking(
     Ok((engine, event_log))
 }
 
+/// Pump the clients' event queues until `done` holds or `timeout` elapses.
+/// Returns whether the condition was met.
+async fn pump_events_until<F, Fut>(clients: &[&Client], timeout: Duration, done: F) -> bool
+where
+    F: Fn() -> Fut,
+    Fut: std::future::Future<Output = bool>,
+{
+    let deadline = tokio::time::Instant::now() + timeout;
+    loop {
+        for client in clients {
+            let _ = client.event_dispatcher().process_events();
+        }
+        if done().await {
+            return true;
+        }
+        if tokio::time::Instant::now() >= deadline {
+            return false;
+        }
+        sleep(Duration::from_millis(50)).await;
+    }
+}
+
 crate::integration_test!(
     test_offline_changes_sync_on_reconnect,
     |mut ctx: TestContext| async move {
@@ -205,12 +227,11 @@ crate::integration_test!(
         json!({ "title": "Task 1", "status": "pending", "description": "Created while online" })
     ).await.expect("Failed to create document");
 
-        // Process events and wait for sync
-        for _ in 0..10 {
-            let _ = client1.event_dispatcher().process_events();
-            let _ = client2.event_dispatcher().process_events();
-            sleep(Duration::from_millis(100)).await;
-        }
+        // Process events until client 2 has received the new document
+        pump_events_until(&[&client1, &client2], Duration::from_secs(5), || async {
+            !events2.lock().unwrap().created.is_empty()
+        })
+        .await;
 
         // Verify both clients see the document and received events
         {
@@ -228,8 +249,11 @@ crate::integration_test!(
         tracing::info!("Simulating server offline...");
         ctx.kill_all_sync_servers().await;
 
-        // Give clients time to detect disconnection
-        sleep(Duration::from_millis(1000)).await;
+        // Give clients time to detect disconnection, moving on as soon as they have
+        pump_events_until(&[&client1, &client2], Duration::from_secs(5), || async {
+            !client1.is_connected() && !client2.is_connected()
+        })
+        .await;
 
         // Make changes while offline
         tracing::info!("Making offline changes...");
@@ -290,9 +314,22 @@ crate::integration_test!(
             .expect("Failed to start server");
         ctx.wait_for_server().await.expect("Server didn't start");
 
-        // Give clients time to reconnect and sync
+        // Wait until both clients have reconnected, uploaded their offline
+        // changes and pulled each other's
         tracing::info!("Waiting for reconnection and sync...");
-        sleep(Duration::from_millis(3000)).await;
+        let (c1, c2) = (&client1, &client2);
+        pump_events_until(&[c1, c2], Duration::from_secs(15), || async move {
+            for client in [c1, c2] {
+                if !client.is_connected()
+                    || !matches!(client.count_pending_sync().await, Ok(0))
+                    || !matches!(client.count_documents().await, Ok(3))
+                {
+                    return false;
+                }
+            }
+            true
+        })
+        .await;
 
         // Process events multiple times to ensure all events are handled
         for _ in 0..5 {
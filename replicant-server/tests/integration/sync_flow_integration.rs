@@ -19,14 +19,12 @@ crate::integration_test!(
             .expect("Failed to create user");
 
         // Create two clients with robust retry logic
-        let client1 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client");
-        let client2 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client");
+        let (client1, client2) = tokio::join!(
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+        );
+        let client1 = client1.expect("Failed to create client");
+        let client2 = client2.expect("Failed to create client");
 
         // Client 1 creates a document
         let _doc = client1
@@ -35,13 +33,11 @@ crate::integration_test!(
             .expect("Failed to create document");
 
         // Wait for automatic sync
-        tokio::time::sleep(tokio::time::Duration::from_secs(1)).await;
-        let docs = client2
-            .get_all_documents()
-            .await
-            .expect("Failed to get documents");
-        assert_eq!(docs.len(), 1);
-        assert_eq!(docs[0].title_or_default(), "Sync Test Doc");
+        assert_all_clients_converge(&[&client2], 1, 5, |doc| {
+            let title_match = doc.title_or_default() == "Sync Test Doc";
+            async move { title_match }
+        })
+        .await;
 
         // Keep clients alive briefly to avoid disconnect race
         tokio::time::sleep(tokio::time::Duration::from_millis(100)).await;
@@ -66,14 +62,12 @@ crate::integration_test!(
             .await
             .expect("Failed to create user");
 
-        let client1 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client");
-        let client2 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client");
+        let (client1, client2) = tokio::join!(
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+        );
+        let client1 = client1.expect("Failed to create client");
+        let client2 = client2.expect("Failed to create client");
 
         // Both clients create documents
         let _doc1 = client1
@@ -85,10 +79,9 @@ crate::integration_test!(
             .await
             .expect("Failed to create document");
 
-        // Wait for automatic sync
-        tokio::time::sleep(tokio::time::Duration::from_secs(1)).await;
+        // Wait for automatic sync; both should see both documents
+        assert_all_clients_converge(&[&client1, &client2], 2, 5, |_| async { true }).await;
 
-        // Both should see both documents
         let docs1 = client1
             .get_all_documents()
             .await
@@ -139,14 +132,12 @@ crate::integration_test!(
             .await
             .expect("Failed to create user");
 
-        let client1 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client");
-        let client2 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client");
+        let (client1, client2) = tokio::join!(
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+        );
+        let client1 = client1.expect("Failed to create client");
+        let client2 = client2.expect("Failed to create client");
 
         // Client 1 creates a document
         let doc = client1
@@ -155,7 +146,7 @@ crate::integration_test!(
             .expect("Failed to create document");
 
         // Wait for automatic sync
-        tokio::time::sleep(tokio::time::Duration::from_secs(1)).await;
+        assert_all_clients_converge(&[&client2], 1, 5, |_| async { true }).await;
 
         // Client 1 updates the document
         client1
@@ -163,16 +154,12 @@ crate::integration_test!(
             .await
             .expect("Failed to update document");
 
-        // Wait for automatic sync
-        tokio::time::sleep(tokio::time::Duration::from_secs(1)).await;
-
-        // Client 2 should see the update
-        let docs = client2
-            .get_all_documents()
-            .await
-            .expect("Failed to get documents");
-        assert_eq!(docs.len(), 1);
-        assert_eq!(docs[0].content["text"], "Updated content");
+        // Wait for automatic sync; client 2 should see the update
+        assert_all_clients_converge(&[&client2], 1, 5, |doc| {
+            let text_match = doc.content["text"] == "Updated content";
+            async move { text_match }
+        })
+        .await;
 
         // Keep clients alive briefly to avoid disconnect race
         tokio::time::sleep(tokio::time::Duration::from_millis(100)).await;
@@ -197,14 +184,12 @@ crate::integration_test!(
             .await
             .expect("Failed to create user");
 
-        let client1 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client");
-        let client2 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client");
+        let (client1, client2) = tokio::join!(
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+        );
+        let client1 = client1.expect("Failed to create client");
+        let client2 = client2.expect("Failed to create client");
 
         // Client 1 creates documents
         let _doc1 = client1
@@ -217,15 +202,7 @@ crate::integration_test!(
             .expect("Failed to create document");
 
         // Wait for automatic sync
-        tokio::time::sleep(tokio::time::Duration::from_secs(1)).await;
-        assert_eq!(
-            client2
-                .get_all_documents()
-                .await
-                .expect("Failed to get documents")
-                .len(),
-            2
-        );
+        assert_all_clients_converge(&[&client2], 2, 5, |_| async { true }).await;
 
         // Client 1 deletes one document
         client1
@@ -233,16 +210,12 @@ crate::integration_test!(
             .await
             .expect("Failed to delete document");
 
-        // Wait for automatic sync
-        tokio::time::sleep(tokio::time::Duration::from_secs(1)).await;
-
-        // Client 2 should only see one document
-        let remaining = client2
-            .get_all_documents()
-            .await
-            .expect("Failed to get documents");
-        assert_eq!(remaining.len(), 1);
-        assert_eq!(remaining[0].title_or_default(), "Keep Me");
+        // Wait for automatic sync; client 2 should only see one document
+        assert_all_clients_converge(&[&client2], 1, 5, |doc| {
+            let title_match = doc.title_or_default() == "Keep Me";
+            async move { title_match }
+        })
+        .await;
 
         // Keep clients alive briefly to avoid disconnect race
         tokio::time::sleep(tokio::time::Duration::from_millis(100)).await;
@@ -267,14 +240,12 @@ crate::integration_test!(
             .await
             .expect("Failed to create user");
 
-        let client1 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client");
-        let client2 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client");
+        let (client1, client2) = tokio::join!(
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+        );
+        let client1 = client1.expect("Failed to create client");
+        let client2 = client2.expect("Failed to create client");
 
         // Create a large document
         let large_array: Vec<serde_json::Value> = (0..1000)
@@ -305,16 +276,12 @@ crate::integration_test!(
             .await
             .expect("Failed to create document");
 
-        // Wait for automatic sync
-        tokio::time::sleep(tokio::time::Duration::from_secs(2)).await;
-
-        // Verify the document synced correctly
-        let docs = client2
-            .get_all_documents()
-            .await
-            .expect("Failed to get documents");
-        assert_eq!(docs.len(), 1);
-        assert_eq!(docs[0].content["items"].as_array().unwrap().len(), 1000);
+        // Wait for automatic sync and verify the document synced correctly
+        assert_all_clients_converge(&[&client2], 1, 10, |doc| {
+            let items_match = doc.content["items"].as_array().map(Vec::len) == Some(1000);
+            async move { items_match }
+        })
+        .await;
 
         // Keep clients alive briefly to avoid disconnect race
         tokio::time::sleep(tokio::time::Duration::from_millis(100)).await;
@@ -340,18 +307,14 @@ crate::integration_test!(
             .expect("Failed to create user");
 
         // Phase 1: All clients online and synced
-        let client1 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client1");
-        let client2 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client2");
-        let client3 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client3");
+        let (client1, client2, client3) = tokio::join!(
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+        );
+        let client1 = client1.expect("Failed to create client1");
+        let client2 = client2.expect("Failed to create client2");
+        let client3 = client3.expect("Failed to create client3");
 
         // Create initial shared document
         let shared_doc = client1
@@ -526,14 +489,12 @@ crate::integration_test!(
             .expect("Failed to create user");
 
         // Create two clients with robust retry logic
-        let client1 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client1");
-        let client2 = ctx
-            .create_test_client(email, user_id, &api_key, &api_secret)
-            .await
-            .expect("Failed to create client2");
+        let (client1, client2) = tokio::join!(
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+            ctx.create_test_client(email, user_id, &api_key, &api_secret),
+        );
+        let client1 = client1.expect("Failed to create client1");
+        let client2 = client2.expect("Failed to create client2");
 
         // Client 1 creates a document with an array
         let doc = client1
@@ -1,5 +1,5 @@
-use crate::integration::helpers::TestContext;
-use replicant_client::Client;
+use crate::integration::helpers::{assert_all_clients_converge, wait_until, TestContext};
+use replicant_client::{Client, ClientDatabaseOptions};
 use serde_json::json;
 use std::fs;
 use std::time::Duration;
@@ -32,7 +32,9 @@ async fn create_persistent_client(
     server_url: &str,
 ) -> Result<Client, Box<dyn std::error::Error + Send + Sync>> {
     // Create and initialize the client database with the user
-    let db = replicant_client::ClientDatabase::new(db_path).await?;
+    let db =
+        replicant_client::ClientDatabase::new_with_options(db_path, ClientDatabaseOptions::tuned())
+            .await?;
     db.run_migrations().await?;
 
     // Generate a unique client_id for this test client
@@ -50,17 +52,21 @@ async fn create_persistent_client(
 
     // Create sync engine with persistent database
     // Note: In these special tests that use persistent clients, we use the token as both api_key and placeholder secret
-    let engine = Client::new(
+    let engine = Client::new_with_db_options(
         db_path,
         &format!("{}/ws", server_url),
         "test-user@example.com",
         token,
         token,
+        ClientDatabaseOptions::tuned(),
     )
     .await?;
 
-    // Give it time to connect (connection starts automatically)
-    sleep(Duration::from_millis(500)).await;
+    // Wait for the automatic connection instead of a fixed delay
+    let deadline = tokio::time::Instant::now() + Duration::from_secs(5);
+    while !engine.is_connected() && tokio::time::Instant::now() < deadline {
+        sleep(Duration::from_millis(25)).await;
+    }
 
     Ok(engine)
 }
@@ -101,8 +107,10 @@ crate::integration_test!(
             .expect("Failed to create user");
         let token = api_key.clone(); // Keep token variable for state persistence
 
-        // Create two clients with persistent database files
-        let test_dir = format!("/tmp/offline_sync_test_{}", user_id);
+        // Create two clients with persistent database files, in the directory
+        // the runner created for this run (and removes afterwards) if it set one
+        let test_dir = std::env::var("OFFLINE_TEST_DIR")
+            .unwrap_or_else(|_| format!("/tmp/offline_sync_test_{}", user_id));
         std::fs::create_dir_all(&test_dir).expect("Failed to create test directory");
 
         let client1_db_path = format!("sqlite:{}/client1.sqlite3?mode=rwc", test_dir);
@@ -113,15 +121,11 @@ crate::integration_test!(
             .await
             .expect("Failed to create client 1");
 
-        sleep(Duration::from_millis(500)).await;
-
         tracing::info!("Creating client 2 with persistent database...");
         let client2 = create_persistent_client(user_id, &token, &client2_db_path, &ctx.server_url)
             .await
             .expect("Failed to create client 2");
 
-        sleep(Duration::from_millis(500)).await;
-
         // Create some initial documents
         tracing::info!("Creating initial documents...");
 
@@ -146,8 +150,8 @@ crate::integration_test!(
             .await
             .expect("Failed to create doc3");
 
-        // Wait for sync
-        sleep(Duration::from_millis(2000)).await;
+        // Wait until both clients have all three documents
+        assert_all_clients_converge(&[&client1, &client2], 3, 10, |_| async { true }).await;
 
         // Verify both clients see all documents
         let docs1 = client1
@@ -207,12 +211,14 @@ crate::integration_test!(
             .expect("Client 1 DB path not found");
 
         // Open the database directly for offline operations
-        let client_db = replicant_client::ClientDatabase::new(client1_db_path)
-            .await
-            .expect("Failed to open client database");
+        let client_db = replicant_client::ClientDatabase::new_with_options(
+            client1_db_path,
+            ClientDatabaseOptions::tuned(),
+        )
+        .await
+        .expect("Failed to open client database");
 
         tracing::info!("Working with offline client database...");
-        sleep(Duration::from_millis(500)).await;
 
         // Make changes while offline using direct database operations
         tracing::info!("Making offline changes...");
@@ -328,9 +334,39 @@ crate::integration_test!(
             .await
             .expect("Failed to create client 2");
 
-        // Give plenty of time for reconnection and sync
+        // Phases 1 and 2 always record these ids, so a missing one means the
+        // state file is stale or incomplete and there would be nothing to check
+        let offline_doc_id = state
+            .offline_doc_id
+            .expect("Phase 2 did not record the offline-created document");
+        let doc1_id = state.doc1_id.expect("Phase 1 did not record document 1");
+        let doc3_id = state.doc3_id.expect("Phase 1 did not record document 3");
+
+        // Poll until the offline create, update and delete have reached both
+        // clients; on timeout the checks below report which one is missing
         tracing::info!("Waiting for reconnection and sync...");
-        sleep(Duration::from_millis(5000)).await;
+        let (c1, c2) = (&client1, &client2);
+        let synced = wait_until(
+            || async move {
+                let (Ok(docs1), Ok(docs2)) =
+                    (c1.get_all_documents().await, c2.get_all_documents().await)
+                else {
+                    return false;
+                };
+                [&docs1, &docs2].iter().all(|docs| {
+                    docs.iter().any(|d| d.id == offline_doc_id)
+                        && !docs.iter().any(|d| d.id == doc3_id)
+                        && docs
+                            .iter()
+                            .any(|d| d.id == doc1_id && d.content["offline"] == true)
+                })
+            },
+            15,
+        )
+        .await;
+        if !synced {
+            tracing::warn!("Offline changes did not reach both clients within 15 seconds");
+        }
 
         // Check documents on both clients
         let docs1 = client1
@@ -353,50 +389,45 @@ crate::integration_test!(
         );
 
         // Verify the offline document exists on both
-        if let Some(offline_doc_id) = state.offline_doc_id {
-            let doc1_found = docs1.iter().any(|d| d.id == offline_doc_id);
-            let doc2_found = docs2.iter().any(|d| d.id == offline_doc_id);
-
-            assert!(
-                doc1_found,
-                "Client 1 should see the offline-created document"
-            );
-            assert!(
-                doc2_found,
-                "Client 2 should see the offline-created document"
-            );
-
-            tracing::info!("✓ Offline-created document synced to both clients");
-        }
+        assert!(
+            docs1.iter().any(|d| d.id == offline_doc_id),
+            "Client 1 should see the offline-created document"
+        );
+        assert!(
+            docs2.iter().any(|d| d.id == offline_doc_id),
+            "Client 2 should see the offline-created document"
+        );
+        tracing::info!("✓ Offline-created document synced to both clients");
 
         // Verify document 3 was deleted on both
-        if let Some(doc3_id) = state.doc3_id {
-            let doc1_found = docs1.iter().any(|d| d.id == doc3_id);
-            let doc2_found = docs2.iter().any(|d| d.id == doc3_id);
-
-            assert!(!doc1_found, "Client 1 should not see deleted document 3");
-            assert!(!doc2_found, "Client 2 should not see deleted document 3");
-
-            tracing::info!("✓ Deletion synced to both clients");
-        }
+        assert!(
+            !docs1.iter().any(|d| d.id == doc3_id),
+            "Client 1 should not see deleted document 3"
+        );
+        assert!(
+            !docs2.iter().any(|d| d.id == doc3_id),
+            "Client 2 should not see deleted document 3"
+        );
+        tracing::info!("✓ Deletion synced to both clients");
 
         // Verify document 1 has updated content
-        if let Some(doc1_id) = state.doc1_id {
-            let doc1_client1 = docs1.iter().find(|d| d.id == doc1_id);
-            let doc1_client2 = docs2.iter().find(|d| d.id == doc1_id);
-
-            if let (Some(d1), Some(d2)) = (doc1_client1, doc1_client2) {
-                assert_eq!(
-                    d1.content["offline"], true,
-                    "Client 1 should see offline update"
-                );
-                assert_eq!(
-                    d2.content["offline"], true,
-                    "Client 2 should see offline update"
-                );
-                tracing::info!("✓ Offline update synced to both clients");
-            }
-        }
+        let d1 = docs1
+            .iter()
+            .find(|d| d.id == doc1_id)
+            .expect("Client 1 should see document 1");
+        let d2 = docs2
+            .iter()
+            .find(|d| d.id == doc1_id)
+            .expect("Client 2 should see document 1");
+        assert_eq!(
+            d1.content["offline"], true,
+            "Client 1 should see offline update"
+        );
+        assert_eq!(
+            d2.content["offline"], true,
+            "Client 2 should see offline update"
+        );
+        tracing::info!("✓ Offline update synced to both clients");
 
         tracing::info!("✓ Phase 3 complete - sync recovery successful");
     },
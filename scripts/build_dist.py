@@ -5,19 +5,80 @@ Creates a stable SDK in the dist/ folder.
 """
 
 import argparse
+import filecmp
 import json
 import os
 import platform
 import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 
-def run_command(cmd: list[str], check: bool = True) -> subprocess.CompletedProcess:
-    """Run a command and return the result."""
-    return subprocess.run(cmd, check=check, capture_output=True, text=True)
+def copy_files(tasks: list[tuple[Path, Path]]) -> None:
+    """Copy independent (src, dst) pairs concurrently."""
+    if not tasks:
+        return
+    with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+        list(executor.map(lambda task: shutil.copyfile(*task), tasks))
+
+
+def publish_dir(staged: Path, dst: Path) -> bool:
+    """Swap a fully staged directory into place; keep dst if nothing changed."""
+    names = sorted(p.name for p in staged.iterdir())
+    if dst.is_dir() and sorted(p.name for p in dst.iterdir()) == names:
+        _, mismatch, errors = filecmp.cmpfiles(staged, dst, names, shallow=False)
+        if not mismatch and not errors:
+            shutil.rmtree(staged)
+            return False
+    if dst.exists():
+        shutil.rmtree(dst)
+    os.replace(staged, dst)
+    return True
+
+
+def strip_timestamp(text: str) -> list[str]:
+    """Return VERSION.md lines without the volatile "Generated on" line."""
+    return [line for line in text.splitlines() if not line.startswith("Generated on:")]
+
+
+def run_command(cmd: list[str], check: bool = True, capture: bool = True) -> subprocess.CompletedProcess:
+    """Run a command and return the result.
+
+    With capture=False the child writes straight to our stdout/stderr
+    instead of being buffered into Python strings.
+    """
+    return subprocess.run(cmd, check=check, capture_output=capture, text=capture)
+
+
+def get_client_version() -> str:
+    """Read the replicant-client version, only asking cargo when the manifest can't say."""
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        tomllib = None
+
+    if tomllib is not None:
+        with open("replicant-client/Cargo.toml", "rb") as f:
+            version = tomllib.load(f).get("package", {}).get("version")
+        if isinstance(version, str):
+            return version
+        if version == {"workspace": True}:
+            with open("Cargo.toml", "rb") as f:
+                workspace = tomllib.load(f).get("workspace", {})
+            version = workspace.get("package", {}).get("version")
+            if isinstance(version, str):
+                return version
+
+    result = run_command(["cargo", "metadata", "--no-deps", "--format-version", "1"], check=False)
+    if result.returncode == 0:
+        metadata = json.loads(result.stdout)
+        for pkg in metadata.get("packages", []):
+            if pkg.get("name") == "replicant-client":
+                return pkg.get("version", "unknown")
+    return "unknown"
 
 
 def main():
@@ -35,9 +96,10 @@ def main():
         print("Skipping build (using pre-built libraries)...")
     else:
         print("Building replicant-client library...")
-        result = run_command(["cargo", "build", "--package", "replicant-client", "--release"])
+        result = run_command(["cargo", "build", "--package", "replicant-client", "--release"],
+                             check=False, capture=False)
         if result.returncode != 0:
-            print(f"Build failed: {result.stderr}")
+            print("Build failed (see cargo output above)")
             sys.exit(1)
 
     print("Creating dist directory structure...")
@@ -45,12 +107,16 @@ def main():
     for subdir in ["include", "lib", "examples", "cmake", "juce/replicant"]:
         (dist / subdir).mkdir(parents=True, exist_ok=True)
 
+    # Collect (src, dst) pairs and copy them all at once below
+    tasks: list[tuple[Path, Path]] = []
+    copied: list[str] = []
+
     # Copy C header
     print("Copying generated C header to dist...")
     c_header = Path("replicant-client/target/include/replicant.h")
     if c_header.exists():
-        shutil.copy(c_header, dist / "include" / "replicant.h")
-        print("[OK] C header copied to dist/include/replicant.h")
+        tasks.append((c_header, dist / "include" / "replicant.h"))
+        copied.append("[OK] C header copied to dist/include/replicant.h")
     else:
         print("[FAIL] Generated C header not found. Make sure cargo build completed successfully.")
         sys.exit(1)
@@ -59,8 +125,8 @@ def main():
     print("Copying C++ wrapper header to dist...")
     cpp_header = Path("replicant-client/include/replicant.hpp")
     if cpp_header.exists():
-        shutil.copy(cpp_header, dist / "include" / "replicant.hpp")
-        print("[OK] C++ header copied to dist/include/replicant.hpp")
+        tasks.append((cpp_header, dist / "include" / "replicant.hpp"))
+        copied.append("[OK] C++ header copied to dist/include/replicant.hpp")
     else:
         print("[WARN] C++ header not found at replicant-client/include/replicant.hpp")
 
@@ -90,28 +156,37 @@ def main():
     for lib_path, lib_type in libs:
         lib = Path(lib_path)
         if lib.exists():
-            shutil.copy(lib, dist / "lib" / lib.name)
-            print(f"[OK] {lib_type} copied to dist/lib/")
+            tasks.append((lib, dist / "lib" / lib.name))
+            copied.append(f"[OK] {lib_type} copied to dist/lib/")
 
     # Copy JUCE module
     print("Copying JUCE module to dist...")
     juce_src = Path("wrappers/juce/replicant")
     juce_dst = dist / "juce" / "replicant"
 
+    juce_staged = juce_dst.with_name(juce_dst.name + ".new")
+
     if juce_src.exists():
-        # Clear destination
-        if juce_dst.exists():
-            shutil.rmtree(juce_dst)
-        juce_dst.mkdir(parents=True, exist_ok=True)
+        # Stage into a sibling directory so an unchanged module is left untouched
+        if juce_staged.exists():
+            shutil.rmtree(juce_staged)
+        juce_staged.mkdir(parents=True)
 
         # Copy files
         for file in ["replicant.h", "replicant.cpp"]:
             src_file = juce_src / file
             if src_file.exists():
-                shutil.copy(src_file, juce_dst / file)
+                tasks.append((src_file, juce_staged / file))
+    else:
+        print("[WARN] JUCE module not found at wrappers/juce/replicant/")
 
+    copy_files(tasks)
+    for message in copied:
+        print(message)
+
+    if juce_src.exists():
         # Fix include path for dist layout
-        header_file = juce_dst / "replicant.h"
+        header_file = juce_staged / "replicant.h"
         if header_file.exists():
             content = header_file.read_text()
             content = content.replace(
@@ -120,20 +195,14 @@ def main():
             )
             header_file.write_text(content)
 
-        print("[OK] JUCE module copied to dist/juce/replicant/")
-    else:
-        print("[WARN] JUCE module not found at wrappers/juce/replicant/")
+        if publish_dir(juce_staged, juce_dst):
+            print("[OK] JUCE module copied to dist/juce/replicant/")
+        else:
+            print("[OK] JUCE module in dist/juce/replicant/ is up to date")
 
     # Get version from Cargo
     print("Adding version information...")
-    result = run_command(["cargo", "metadata", "--no-deps", "--format-version", "1"], check=False)
-    version = "unknown"
-    if result.returncode == 0:
-        metadata = json.loads(result.stdout)
-        for pkg in metadata.get("packages", []):
-            if pkg.get("name") == "replicant-client":
-                version = pkg.get("version", "unknown")
-                break
+    version = get_client_version()
 
     # Get Rust version
     rust_result = run_command(["rustc", "--version"], check=False)
@@ -141,12 +210,15 @@ def main():
 
     # Write version file
     version_file = dist / "VERSION.md"
-    version_file.write_text(f"""# Replicant SDK v{version}
+    version_text = f"""# Replicant SDK v{version}
 
 Generated on: {datetime.now().isoformat()}
 Rust version: {rust_version}
 Platform: {platform.system()} {platform.machine()}
-""")
+"""
+    # Keep the old file (and its mtime) when only the timestamp would change
+    if not version_file.exists() or strip_timestamp(version_file.read_text()) != strip_timestamp(version_text):
+        version_file.write_text(version_text)
 
     print()
     print("[OK] Distribution build complete!")
@@ -0,0 +1,142 @@
+#!/bin/bash
+
+# Shared helpers for the test runner scripts
+# Source from a runner in this directory, with the repository root as the working directory
+
+# Colors for output (plain text when stdout is not a terminal, e.g. CI logs)
+if [ -t 1 ]; then
+    RED='\033[0;31m'
+    GREEN='\033[0;32m'
+    YELLOW='\033[1;33m'
+    BLUE='\033[0;34m'
+    MAGENTA='\033[0;35m'
+    NC='\033[0m' # No Color
+else
+    RED='' GREEN='' YELLOW='' BLUE='' MAGENTA='' NC=''
+fi
+
+log() {
+    echo -e "${GREEN}[$(date +'%H:%M:%S')] $1${NC}"
+}
+
+warn() {
+    echo -e "${YELLOW}[$(date +'%H:%M:%S')] WARNING: $1${NC}"
+}
+
+error() {
+    echo -e "${RED}[$(date +'%H:%M:%S')] ERROR: $1${NC}"
+}
+
+info() {
+    echo -e "${BLUE}[$(date +'%H:%M:%S')] INFO: $1${NC}"
+}
+
+# Check whether anything accepts connections on a local port, using bash's
+# /dev/tcp rather than forking lsof
+port_in_use() {
+    { exec 3<>"/dev/tcp/localhost/$1"; } 2>/dev/null || return 1
+    exec 3<&- 3>&-
+}
+
+# Probe a local server's /health endpoint over bash's /dev/tcp instead of
+# forking curl
+# Usage: server_healthy <port>
+server_healthy() {
+    local status
+    { exec 3<>"/dev/tcp/localhost/$1"; } 2>/dev/null || return 1
+    printf 'GET /health HTTP/1.0\r\nHost: localhost\r\n\r\n' >&3
+    read -r -t 1 status <&3 || true
+    exec 3<&- 3>&-
+    [[ "$status" == *" 200 "* ]]
+}
+
+# Run a command until it succeeds, backing off from 50ms up to 500ms between
+# attempts; fails once <timeout> seconds have passed
+# Usage: wait_with_backoff <timeout> <command> [args...]
+wait_with_backoff() {
+    local deadline=$((SECONDS + $1))
+    local delay_ms=50
+    local delay
+    shift
+    until "$@"; do
+        [ $SECONDS -ge $deadline ] && return 1
+        printf -v delay '%d.%03d' $((delay_ms / 1000)) $((delay_ms % 1000))
+        sleep "$delay"
+        delay_ms=$((delay_ms * 3 / 2))
+        [ $delay_ms -gt 500 ] && delay_ms=500
+    done
+    return 0
+}
+
+# Refuse database names that would need quoting (or inject SQL) when
+# interpolated into DROP/CREATE DATABASE; unquoted identifiers are also folded
+# to lowercase, which would no longer match DATABASE_URL
+# Usage: check_database_name <name>
+check_database_name() {
+    if [[ ! "$1" =~ ^[a-z0-9_]+$ ]]; then
+        error "Invalid database name '$1': use lowercase letters, digits and underscores"
+        exit 1
+    fi
+}
+
+# Empty a test database left by a previous run instead of paying for
+# DROP/CREATE; fails, so the caller can recreate it, when the database is
+# missing or its migrations no longer apply
+# Usage: reuse_database <name> <url>
+reuse_database() {
+    psql -d "$1" -c "" 2>/dev/null || return 1
+    DATABASE_URL="$2" sqlx migrate run --source replicant-server/migrations || return 1
+    info "Reusing existing database $1, truncating its tables"
+    psql -d "$1" -v ON_ERROR_STOP=1 -q -c "
+        DO \$\$
+        DECLARE tables text;
+        BEGIN
+            SELECT string_agg(format('%I', tablename), ', ') INTO tables
+            FROM pg_tables
+            WHERE schemaname = 'public' AND tablename <> '_sqlx_migrations';
+            IF tables IS NOT NULL THEN
+                EXECUTE 'TRUNCATE ' || tables || ' RESTART IDENTITY CASCADE';
+            END IF;
+        END
+        \$\$;"
+}
+
+# Build replicant-server once per session and export its path
+# SKIP_BUILD=1 skips cargo for edit-rerun loops against an existing build
+# Usage: build_server_bin <debug|release>
+build_server_bin() {
+    local profile=$1
+    local bin="$PWD/target/$profile/replicant-server"
+
+    if [ -n "${SKIP_BUILD:-}" ]; then
+        if [ ! -x "$bin" ]; then
+            error "SKIP_BUILD is set but $bin has not been built"
+            exit 1
+        fi
+        info "SKIP_BUILD set, using existing $bin"
+    else
+        local flags=()
+        [ "$profile" = "release" ] && flags+=(--release)
+        DATABASE_URL="$DATABASE_URL" cargo build --bin replicant-server "${flags[@]}"
+    fi
+
+    export REPLICANT_SERVER_BIN="$bin"
+}
+
+# Send SIGTERM to a process and wait up to <timeout> seconds for it to exit,
+# escalating to SIGKILL; returns as soon as the process is gone
+# Usage: stop_pid <pid> [timeout]
+stop_pid() {
+    local pid=$1
+    local deadline=$((SECONDS + ${2:-5}))
+
+    kill "$pid" 2>/dev/null || return 0
+    while kill -0 "$pid" 2>/dev/null; do
+        if [ $SECONDS -ge $deadline ]; then
+            warn "Force killing process $pid"
+            kill -9 "$pid" 2>/dev/null || true
+            return 0
+        fi
+        sleep 0.1
+    done
+}
@@ -5,11 +5,8 @@
 
 set -e
 
-# Colors for output
-RED='\033[0;31m'
-GREEN='\033[0;32m'
-YELLOW='\033[1;33m'
-NC='\033[0m' # No Color
+# Colors (plain text when stdout is not a terminal) and shared helpers
+source "$(dirname "$0")/common.sh"
 
 echo -e "${GREEN}🐳 Docker Integration Test Runner${NC}"
 echo "=================================="
@@ -34,48 +31,46 @@ trap cleanup EXIT
 echo -e "${YELLOW}📦 Starting test database...${NC}"
 docker-compose -f docker-compose.test.yml up -d
 
-# Wait for PostgreSQL to be ready
-echo -e "${YELLOW}⏳ Waiting for PostgreSQL...${NC}"
-for i in {1..30}; do
-    if docker-compose -f docker-compose.test.yml exec -T postgres-test pg_isready -U postgres -d sync_test_db >/dev/null 2>&1; then
-        echo -e "${GREEN}✅ PostgreSQL is ready${NC}"
-        break
-    fi
-    if [ $i -eq 30 ]; then
-        echo -e "${RED}❌ PostgreSQL failed to start${NC}"
-        exit 1
-    fi
-    sleep 2
-done
+# Wait for PostgreSQL to be ready, backing off from 50ms up to 500ms
+# (the published port accepts connections before postgres does, so keep
+# asking pg_isready rather than probing the port)
+postgres_ready() {
+    docker-compose -f docker-compose.test.yml exec -T postgres-test \
+        pg_isready -U postgres -d sync_test_db >/dev/null 2>&1
+}
 
-echo -e "${YELLOW}🔨 Building server...${NC}"
-cargo build --bin replicant-server
+echo -e "${YELLOW}⏳ Waiting for PostgreSQL...${NC}"
+if ! wait_with_backoff 60 postgres_ready; then
+    echo -e "${RED}❌ PostgreSQL failed to start${NC}"
+    exit 1
+fi
+echo -e "${GREEN}✅ PostgreSQL is ready${NC}"
 
 echo -e "${YELLOW}📊 Running migrations...${NC}"
-cd replicant-server
-DATABASE_URL="$TEST_DATABASE_URL" sqlx migrate run
-cd ..
+DATABASE_URL="$TEST_DATABASE_URL" sqlx migrate run --source replicant-server/migrations
+
+# Migrate first so the query checks build against the current schema;
+# SKIP_BUILD=1 reuses an existing debug build
+echo -e "${YELLOW}🔨 Building server...${NC}"
+DATABASE_URL="$TEST_DATABASE_URL" build_server_bin debug
 
 echo -e "${YELLOW}🚀 Starting sync server...${NC}"
-DATABASE_URL="$TEST_DATABASE_URL" RUST_LOG=warn PORT="$SERVER_PORT" \
-    cargo run --bin replicant-server &
+DATABASE_URL="$TEST_DATABASE_URL" RUST_LOG=warn BIND_ADDRESS="0.0.0.0:$SERVER_PORT" \
+    "$REPLICANT_SERVER_BIN" &
 SERVER_PID=$!
 
-# Wait for server to start (check if port is listening)
+# Ready, or already exited so there is nothing left to wait for
+server_up_or_exited() {
+    server_healthy "$SERVER_PORT" || ! kill -0 "$SERVER_PID" 2>/dev/null
+}
+
+# Wait for the server to answer /health, backing off from 50ms up to 500ms
 echo -e "${YELLOW}⏳ Waiting for sync server...${NC}"
-for i in {1..30}; do
-    if nc -z localhost $SERVER_PORT >/dev/null 2>&1; then
-        echo -e "${GREEN}✅ Sync server is ready${NC}"
-        break
-    fi
-    if [ $i -eq 30 ]; then
-        echo -e "${RED}❌ Sync server failed to start${NC}"
-        echo "Server logs:"
-        jobs -p | xargs -I {} sh -c 'if kill -0 {} 2>/dev/null; then echo "Server is running with PID {}"; else echo "Server process {} has died"; fi'
-        exit 1
-    fi
-    sleep 2
-done
+if ! wait_with_backoff 60 server_up_or_exited || ! server_healthy "$SERVER_PORT"; then
+    echo -e "${RED}❌ Sync server failed to start${NC}"
+    exit 1
+fi
+echo -e "${GREEN}✅ Sync server is ready${NC}"
 
 echo -e "${YELLOW}🧪 Running integration tests...${NC}"
 export RUN_INTEGRATION_TESTS=1
@@ -83,9 +78,6 @@ export TEST_DATABASE_URL="$TEST_DATABASE_URL"
 export SYNC_SERVER_URL="ws://localhost:$SERVER_PORT/ws"
 export RUST_TEST_THREADS=1
 
-echo -e "${YELLOW}⏳ Waiting a moment for server to fully initialize...${NC}"
-sleep 3
-
 if cargo test integration_tests --no-fail-fast -- --test-threads=1 --nocapture; then
     echo -e "${GREEN}✅ All integration tests passed!${NC}"
 else
@@ -9,6 +9,8 @@ set -e  # Exit on any error
 DATABASE_NAME="${DATABASE_NAME:-sync_test_db_local}"
 DATABASE_USER="${DATABASE_USER:-$USER}"
 DATABASE_URL="postgresql://$DATABASE_USER@localhost:5432/$DATABASE_NAME"
+# Connection defaults for every psql call below (psql uses the local socket)
+export PGUSER="$DATABASE_USER" PGDATABASE=postgres
 SERVER_PORT="${SERVER_PORT:-8080}"
 SERVER_PID_FILE="/tmp/sync_server_test.pid"
 SERVER_LOG_FILE="/tmp/sync_server_test.log"
@@ -16,33 +18,15 @@ SERVER_LOG_FILE="/tmp/sync_server_test.log"
 # Test execution timeout (longer for sequential execution with full teardown)
 TEST_TIMEOUT="${TEST_TIMEOUT:-600}" # 10 minutes for full suite
 
-# Colors for output
-RED='\033[0;31m'
-GREEN='\033[0;32m'
-YELLOW='\033[1;33m'
-BLUE='\033[0;34m'
-NC='\033[0m' # No Color
-
-log() {
-    echo -e "${GREEN}[$(date +'%H:%M:%S')] $1${NC}"
-}
-
-warn() {
-    echo -e "${YELLOW}[$(date +'%H:%M:%S')] WARNING: $1${NC}"
-}
-
-error() {
-    echo -e "${RED}[$(date +'%H:%M:%S')] ERROR: $1${NC}"
-}
-
-info() {
-    echo -e "${BLUE}[$(date +'%H:%M:%S')] INFO: $1${NC}"
-}
+source "$(dirname "$0")/common.sh"
+check_database_name "$DATABASE_NAME"
 
 # Kill all processes using a specific port
 kill_port_processes() {
     local port=$1
     info "Checking for processes on port $port..."
+    # Nothing listening means nothing to kill, so skip the lsof scan
+    port_in_use $port || return 0
     
     local pids=$(lsof -ti :$port 2>/dev/null || true)
     if [ -n "$pids" ]; then
@@ -73,21 +57,27 @@ kill_sync_servers() {
 # Database cleanup and setup
 setup_database() {
     log "Setting up test database..."
+
+    if reuse_database "$DATABASE_NAME" "$DATABASE_URL"; then
+        return
+    fi
     
-    # Check if postgres is running
-    if ! psql -U "$DATABASE_USER" -d postgres -c "SELECT 1;" >/dev/null 2>&1; then
+    # Drop existing database (if exists) and create new one in a single psql session;
+    # this doubles as the connectivity check (psql exits with 2 if it can't connect)
+    info "Recreating test database..."
+    local psql_status=0
+    psql -v ON_ERROR_STOP=1 \
+        -c "DROP DATABASE IF EXISTS $DATABASE_NAME;" \
+        -c "CREATE DATABASE $DATABASE_NAME;" || psql_status=$?
+    if [ $psql_status -eq 2 ]; then
         error "PostgreSQL is not running or not accessible"
         error "Make sure PostgreSQL is running and you can connect as user: $DATABASE_USER"
         exit 1
+    elif [ $psql_status -ne 0 ]; then
+        error "Failed to recreate database $DATABASE_NAME"
+        exit 1
     fi
     
-    # Drop existing database (if exists) and create new one
-    info "Dropping existing test database (if exists)..."
-    psql -U "$DATABASE_USER" -d postgres -c "DROP DATABASE IF EXISTS $DATABASE_NAME;" 2>/dev/null || true
-    
-    info "Creating fresh test database..."
-    psql -U "$DATABASE_USER" -d postgres -c "CREATE DATABASE $DATABASE_NAME;"
-    
     # Run migrations
     log "Running database migrations..."
     DATABASE_URL="$DATABASE_URL" sqlx migrate run --source replicant-server/migrations
@@ -102,13 +92,7 @@ cleanup() {
         local server_pid=$(cat "$SERVER_PID_FILE")
         if kill -0 "$server_pid" 2>/dev/null; then
             log "Stopping sync server (PID: $server_pid)"
-            kill "$server_pid" 2>/dev/null || true
-            sleep 1
-            # Force kill if still running
-            if kill -0 "$server_pid" 2>/dev/null; then
-                warn "Force killing server"
-                kill -9 "$server_pid" 2>/dev/null || true
-            fi
+            stop_pid "$server_pid"
         fi
         rm -f "$SERVER_PID_FILE"
     fi
@@ -133,7 +117,7 @@ setup_database
 
 # Step 3: Build the project
 log "Building replicant-server..."
-DATABASE_URL="$DATABASE_URL" cargo build --bin replicant-server
+build_server_bin debug
 
 # Step 4: Run the integration tests (each test manages its own server instance)
 log "Running integration tests..."
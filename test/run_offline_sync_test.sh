@@ -10,34 +10,21 @@ set -e  # Exit on any error
 DATABASE_NAME="${DATABASE_NAME:-sync_offline_test_db}"
 DATABASE_USER="${DATABASE_USER:-$USER}"
 DATABASE_URL="postgresql://$DATABASE_USER@localhost:5432/$DATABASE_NAME"
+# Connection defaults for every psql call below (psql uses the local socket)
+export PGUSER="$DATABASE_USER" PGDATABASE=postgres
 SERVER_PORT="${SERVER_PORT:-8080}"
 SERVER_PID_FILE="/tmp/sync_server_offline_test.pid"
 SERVER_LOG_FILE="/tmp/sync_server_offline_test.log"
 TEST_STATE_FILE="/tmp/sync_offline_test_state.json"
 
-# Colors for output
-RED='\033[0;31m'
-GREEN='\033[0;32m'
-YELLOW='\033[1;33m'
-BLUE='\033[0;34m'
-MAGENTA='\033[0;35m'
-NC='\033[0m' # No Color
+source "$(dirname "$0")/common.sh"
+check_database_name "$DATABASE_NAME"
 
-log() {
-    echo -e "${GREEN}[$(date +'%H:%M:%S')] $1${NC}"
-}
-
-warn() {
-    echo -e "${YELLOW}[$(date +'%H:%M:%S')] WARNING: $1${NC}"
-}
-
-error() {
-    echo -e "${RED}[$(date +'%H:%M:%S')] ERROR: $1${NC}"
-}
-
-info() {
-    echo -e "${BLUE}[$(date +'%H:%M:%S')] INFO: $1${NC}"
-}
+# jq reads cargo's build output to find the test binary
+if ! command -v jq >/dev/null 2>&1; then
+    error "jq is required (e.g. apt install jq or brew install jq)"
+    exit 1
+fi
 
 phase() {
     echo -e "${MAGENTA}[$(date +'%H:%M:%S')] ═══ PHASE: $1 ═══${NC}"
@@ -46,6 +33,8 @@ phase() {
 # Kill all processes using a specific port
 kill_port_processes() {
     local port=$1
+    # Nothing listening means nothing to kill, so skip the lsof scan
+    port_in_use $port || return 0
     local pids=$(lsof -ti :$port 2>/dev/null || true)
     if [ -n "$pids" ]; then
         for pid in $pids; do
@@ -55,37 +44,42 @@ kill_port_processes() {
     fi
 }
 
-# Kill all replicant-server processes
+# Kill the server left behind by a previous run
+# Only the recorded PID and whatever holds our port are touched, so other
+# replicant-server processes on this machine are left alone
 kill_all_servers() {
     info "Killing any existing sync servers..."
-    pkill -f "replicant-server" 2>/dev/null || true
+    if [ -f "$SERVER_PID_FILE" ]; then
+        local pid
+        pid=$(cat "$SERVER_PID_FILE")
+        # The PID may have been reused since that run; only stop it if it is
+        # still a replicant-server (comm is truncated to 15 characters)
+        if kill -0 "$pid" 2>/dev/null &&
+            [[ "$(ps -p "$pid" -o comm= 2>/dev/null)" == replicant-serv* ]]; then
+            stop_pid "$pid" 2
+        fi
+        rm -f "$SERVER_PID_FILE"
+    fi
     kill_port_processes $SERVER_PORT
-    rm -f "$SERVER_PID_FILE"
-    sleep 1
 }
 
 # Start the sync server
 start_server() {
     log "Starting sync server..."
     
-    # Start server in background
-    DATABASE_URL="$DATABASE_URL" cargo run --bin replicant-server > "$SERVER_LOG_FILE" 2>&1 &
+    # Start the pre-built server in background (no cargo staleness check per start)
+    DATABASE_URL="$DATABASE_URL" "$REPLICANT_SERVER_BIN" > "$SERVER_LOG_FILE" 2>&1 &
     local server_pid=$!
     echo $server_pid > "$SERVER_PID_FILE"
     
     # Wait for server to be ready
     log "Waiting for server to be ready..."
     local max_wait=30
-    local waited=0
-    while [ $waited -lt $max_wait ]; do
-        if curl -s http://localhost:$SERVER_PORT/health >/dev/null 2>&1; then
-            log "Server is ready (PID: $server_pid)"
-            return 0
-        fi
-        sleep 1
-        waited=$((waited + 1))
-    done
-    
+    if wait_with_backoff $max_wait server_healthy "$SERVER_PORT"; then
+        log "Server is ready (PID: $server_pid)"
+        return 0
+    fi
+
     error "Server failed to start within ${max_wait} seconds"
     tail -20 "$SERVER_LOG_FILE"
     return 1
@@ -95,15 +89,8 @@ start_server() {
 stop_server() {
     log "Stopping sync server..."
     if [ -f "$SERVER_PID_FILE" ]; then
-        local server_pid=$(cat "$SERVER_PID_FILE")
-        if kill -0 "$server_pid" 2>/dev/null; then
-            kill "$server_pid" 2>/dev/null || true
-            sleep 2
-            # Force kill if still running
-            if kill -0 "$server_pid" 2>/dev/null; then
-                kill -9 "$server_pid" 2>/dev/null || true
-            fi
-        fi
+        # Returns as soon as the server exits rather than always sleeping
+        stop_pid "$(cat "$SERVER_PID_FILE")" 2
         rm -f "$SERVER_PID_FILE"
     fi
     kill_port_processes $SERVER_PORT
@@ -112,19 +99,42 @@ stop_server() {
 # Setup database
 setup_database() {
     log "Setting up test database..."
-    
-    # Drop and recreate database
-    psql -U "$DATABASE_USER" -d postgres -c "DROP DATABASE IF EXISTS $DATABASE_NAME;" 2>/dev/null || true
-    psql -U "$DATABASE_USER" -d postgres -c "CREATE DATABASE $DATABASE_NAME;"
-    
+
+    # Reuse the database from a previous run when its migrations still apply
+    if reuse_database "$DATABASE_NAME" "$DATABASE_URL"; then
+        return
+    fi
+
+    # Drop and recreate database in a single psql session
+    psql -v ON_ERROR_STOP=1 \
+        -c "DROP DATABASE IF EXISTS $DATABASE_NAME;" \
+        -c "CREATE DATABASE $DATABASE_NAME;"
+
     # Run migrations
     DATABASE_URL="$DATABASE_URL" sqlx migrate run --source replicant-server/migrations
 }
 
+# Run one phase test from the prebuilt integration test binary
+# On failure, show the server log tail if the server is running for the phase
+# Usage: run_phase <OFFLINE_TEST_PHASE> <test function> <failure message>
+run_phase() {
+    export OFFLINE_TEST_PHASE="$1"
+    if ! (cd replicant-server && "$TEST_BIN" "integration_tests::test_offline_sync_phases::$2" --exact --nocapture); then
+        error "$3"
+        [ -f "$SERVER_PID_FILE" ] && tail -50 "$SERVER_LOG_FILE"
+        exit 1
+    fi
+}
+
 # Cleanup function
 cleanup() {
     log "Cleaning up..."
     stop_server
+    # The phase clients keep their SQLite files in the per-run directory
+    # created below, so teardown is a single rm -rf
+    if [ -n "${OFFLINE_TEST_DIR:-}" ]; then
+        rm -rf "$OFFLINE_TEST_DIR"
+    fi
     rm -f "$TEST_STATE_FILE"
 }
 
@@ -142,10 +152,25 @@ setup_database
 
 # Build the project
 log "Building replicant-server..."
-DATABASE_URL="$DATABASE_URL" cargo build --bin replicant-server --release
+build_server_bin release
 
 log "Building test binary..."
-cargo build --package replicant-server --test integration_tests --release
+# Build once and run the resulting executable for each phase, so the phases
+# don't each go back through cargo (and, without --release, a debug rebuild)
+if [ -n "${SKIP_BUILD:-}" ]; then
+    TEST_BIN=$(ls -t "$PWD"/target/release/deps/integration_tests-* 2>/dev/null | grep -v '\.d$' | head -1)
+else
+    # Pick the integration_tests artifact by target name rather than relying on
+    # it being the last executable cargo reports; compiler diagnostics are
+    # rendered to stderr so a failed build stays readable
+    TEST_BIN=$(cargo test --package replicant-server --test integration_tests --release --no-run \
+        --message-format=json-render-diagnostics |
+        jq -r 'select(.reason == "compiler-artifact" and .target.name == "integration_tests" and .executable != null) | .executable')
+fi
+if [ ! -x "$TEST_BIN" ]; then
+    error "Failed to build the integration test binary"
+    exit 1
+fi
 
 # Phase 1: Initial online sync
 phase "1: INITIAL ONLINE SYNC"
@@ -156,14 +181,11 @@ info "Creating clients and initial documents..."
 export RUN_INTEGRATION_TESTS=1
 export SYNC_SERVER_URL="ws://localhost:$SERVER_PORT"
 export TEST_DATABASE_URL="$DATABASE_URL"
-export OFFLINE_TEST_PHASE="phase1"
 export OFFLINE_TEST_STATE_FILE="$TEST_STATE_FILE"
+OFFLINE_TEST_DIR=$(mktemp -d /tmp/offline_sync_test_XXXXXX)
+export OFFLINE_TEST_DIR
 
-if ! cargo test --package replicant-server --test integration_tests integration_tests::test_offline_sync_phases::phase1_initial_sync -- --exact --nocapture; then
-    error "Phase 1 failed"
-    tail -50 "$SERVER_LOG_FILE"
-    exit 1
-fi
+run_phase phase1 phase1_initial_sync "Phase 1 failed"
 
 log "✓ Phase 1 complete - Initial sync successful"
 
@@ -173,12 +195,7 @@ stop_server
 info "Server is now offline - simulating network outage"
 
 # Run offline operations
-export OFFLINE_TEST_PHASE="phase2"
-
-if ! cargo test --package replicant-server --test integration_tests integration_tests::test_offline_sync_phases::phase2_offline_changes -- --exact --nocapture; then
-    error "Phase 2 failed"
-    exit 1
-fi
+run_phase phase2 phase2_offline_changes "Phase 2 failed"
 
 log "✓ Phase 2 complete - Offline changes made"
 
@@ -188,13 +205,7 @@ start_server
 info "Server is back online - testing sync recovery"
 
 # Run sync recovery test
-export OFFLINE_TEST_PHASE="phase3"
-
-if ! cargo test --package replicant-server --test integration_tests integration_tests::test_offline_sync_phases::phase3_sync_recovery -- --exact --nocapture; then
-    error "Phase 3 failed"
-    tail -50 "$SERVER_LOG_FILE"
-    exit 1
-fi
+run_phase phase3 phase3_sync_recovery "Phase 3 failed"
 
 log "✓ Phase 3 complete - Sync recovery successful"
 
@@ -202,12 +213,7 @@ log "✓ Phase 3 complete - Sync recovery successful"
 phase "VERIFICATION"
 info "Running final verification..."
 
-export OFFLINE_TEST_PHASE="verify"
-if ! cargo test --package replicant-server --test integration_tests integration_tests::test_offline_sync_phases::phase4_verification -- --exact --nocapture; then
-    error "Verification failed"
-    tail -50 "$SERVER_LOG_FILE"
-    exit 1
-fi
+run_phase verify phase4_verification "Verification failed"
 
 # Success!
 echo ""